@@ -365,7 +365,10 @@ def aggregate_session_data(responses: List[Dict[str, Any]]) -> Dict[str, Any]:
                 'keywords': []
             }
         
-        categories[cat]['responses'].append(resp)
+        # Leave out private analysis caches (e.g. '_text_lower') attached by the ML engine
+        categories[cat]['responses'].append(
+            {k: v for k, v in resp.items() if not k.startswith('_')}
+        )
         categories[cat]['keywords'].extend(resp.get('keywords', []))
         
         all_keywords.extend(resp.get('keywords', []))
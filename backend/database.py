@@ -3,7 +3,7 @@ SQLite database setup and operations for the Psychological Trend Analysis System
 """
 import sqlite3
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 import uuid
@@ -70,6 +70,15 @@ def init_database():
         )
     """)
     
+    # LLM response cache, keyed by a hash of the request payload
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            cache_key TEXT PRIMARY KEY,
+            created_at TEXT,
+            result TEXT
+        )
+    """)
+    
     conn.commit()
     conn.close()
 
@@ -234,6 +243,7 @@ def delete_all_data() -> int:
     cursor.execute("DELETE FROM responses")
     cursor.execute("DELETE FROM reports")
     cursor.execute("DELETE FROM sessions")
+    cursor.execute("DELETE FROM llm_cache")
     
     conn.commit()
     conn.close()
@@ -241,6 +251,47 @@ def delete_all_data() -> int:
     return count
 
 
+def get_cached_llm_result(cache_key: str, max_age_seconds: float) -> Optional[Dict[str, Any]]:
+    """Get a cached LLM result, if stored within max_age_seconds"""
+    cutoff = (datetime.now() - timedelta(seconds=max_age_seconds)).isoformat()
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT result FROM llm_cache WHERE cache_key = ? AND created_at >= ?",
+        (cache_key, cutoff)
+    )
+    row = cursor.fetchone()
+    conn.close()
+    
+    return json.loads(row['result']) if row else None
+
+
+def save_cached_llm_result(
+    cache_key: str,
+    result: Dict[str, Any],
+    max_age_seconds: float,
+    max_rows: int
+):
+    """Cache an LLM result, dropping expired rows and the oldest beyond max_rows"""
+    cutoff = (datetime.now() - timedelta(seconds=max_age_seconds)).isoformat()
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute(
+        """INSERT OR REPLACE INTO llm_cache (cache_key, created_at, result)
+           VALUES (?, ?, ?)""",
+        (cache_key, datetime.now().isoformat(), json.dumps(result))
+    )
+    cursor.execute("DELETE FROM llm_cache WHERE created_at < ?", (cutoff,))
+    cursor.execute(
+        """DELETE FROM llm_cache WHERE cache_key NOT IN
+           (SELECT cache_key FROM llm_cache ORDER BY created_at DESC LIMIT ?)""",
+        (max_rows,)
+    )
+    conn.commit()
+    conn.close()
+
+
 def get_conversation_history(session_id: str) -> List[Dict[str, str]]:
     """Get conversation history for a session"""
     session = get_session(session_id)
@@ -2,6 +2,9 @@
 LLM Prompt Templates for PsychTrend
 All prompts include guardrails to prevent clinical language and hallucination
 """
+import re
+
+from ml_engine.keyword_scan import KeywordScanner
 
 # =============================================================================
 # SYSTEM PROMPTS
@@ -257,6 +260,10 @@ FORBIDDEN_TERMS = [
 ]
 
 
+# All forbidden terms, matched as substrings in a single pass over the text
+FORBIDDEN_TERM_SCANNER = KeywordScanner({"forbidden": FORBIDDEN_TERMS})
+
+
 def validate_output(text: str) -> tuple:
     """
     Validate LLM output for forbidden clinical terms.
@@ -267,25 +274,16 @@ def validate_output(text: str) -> tuple:
     if not text:
         return True, []
     
-    text_lower = text.lower()
-    found_terms = []
-    
-    for term in FORBIDDEN_TERMS:
-        if term in text_lower:
-            found_terms.append(term)
+    found = FORBIDDEN_TERM_SCANNER.scan(text.lower())["forbidden"]
+    found_terms = [term for term in FORBIDDEN_TERMS if term in found]
     
     return len(found_terms) == 0, found_terms
 
 
-def sanitize_output(text: str) -> str:
-    """
-    Remove or replace forbidden terms in output.
-    This is a fallback - ideally the LLM should not generate them.
-    """
-    if not text:
-        return text
-    
-    replacements = {
+# Clinical terms and their replacements, applied in order (case-insensitive)
+SANITIZE_REPLACEMENTS = [
+    (re.compile(re.escape(term), re.IGNORECASE), replacement)
+    for term, replacement in {
         "diagnosis": "insight",
         "disorder": "pattern",
         "mental illness": "behavioral tendency",
@@ -300,13 +298,20 @@ def sanitize_output(text: str) -> str:
         "patient": "individual",
         "diagnose": "identify",
         "mentally ill": "facing challenges"
-    }
+    }.items()
+]
+
+
+def sanitize_output(text: str) -> str:
+    """
+    Remove or replace forbidden terms in output.
+    This is a fallback - ideally the LLM should not generate them.
+    """
+    if not text:
+        return text
     
     result = text
-    for term, replacement in replacements.items():
-        # Case-insensitive replacement
-        import re
-        pattern = re.compile(re.escape(term), re.IGNORECASE)
+    for pattern, replacement in SANITIZE_REPLACEMENTS:
         result = pattern.sub(replacement, result)
     
     return result
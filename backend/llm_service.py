@@ -217,7 +217,8 @@ class LLMService:
             prompt=prompt,
             system_prompt=INSIGHT_EXPLANATION_SYSTEM,
             temperature=0.2,
-            max_tokens=200
+            max_tokens=200,
+            persist=True  # Built only from trend names, scores and fixed descriptions
         )
         
         if result.get("success"):
@@ -349,17 +350,24 @@ class LLMService:
         if not await self.is_available():
             return fallback
         
-        # Generate trend explanations
-        trend_explanations = {}
-        for trend_key, trend_data in trends.items():
-            if isinstance(trend_data, dict) and "score" in trend_data:
-                explanation = await self.explain_insight(
-                    trend_name=trend_data.get("name", trend_key.replace("_", " ").title()),
-                    score=trend_data.get("score", 0.5),
-                    direction=trend_data.get("trend_direction", "stable"),
-                    description=trend_data.get("description", "")
-                )
-                trend_explanations[trend_key] = explanation
+        # Generate trend explanations, concurrently so Ollama can batch them
+        explained = [
+            (trend_key, trend_data) for trend_key, trend_data in trends.items()
+            if isinstance(trend_data, dict) and "score" in trend_data
+        ]
+        explanations = await asyncio.gather(*(
+            self.explain_insight(
+                trend_name=trend_data.get("name", trend_key.replace("_", " ").title()),
+                score=trend_data.get("score", 0.5),
+                direction=trend_data.get("trend_direction", "stable"),
+                description=trend_data.get("description", "")
+            )
+            for trend_key, trend_data in explained
+        ))
+        trend_explanations = {
+            trend_key: explanation
+            for (trend_key, _), explanation in zip(explained, explanations)
+        }
         
         # Generate full report with attention areas and tone guidance
         prompt = REPORT_FULL_TEMPLATE.format(
@@ -1,6 +1,8 @@
 """
 FastAPI Main Application - Psychological Trend Analysis System
 """
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -18,20 +20,32 @@ import database as db
 from chat_logic import get_next_question, start_conversation
 from data_processor import structure_response, process_incomplete_response, aggregate_session_data
 from ml_engine.sentiment import analyze_sentiment_detailed, get_emotional_profile
+from ml_engine.keyword_scan import joined_text_lower
 from ml_engine.trends import get_all_trends
 from ml_engine.clustering import get_behavioral_clusters
 from ml_engine.predictor import get_predictions, identify_strengths, identify_growth_areas
 
 # LLM Integration
 from llm_service import get_llm_service
-from ollama_client import check_ollama_health, DEFAULT_MODEL
+from ollama_client import get_ollama_client, check_ollama_health, DEFAULT_MODEL
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared Ollama connection pool at startup and close it at shutdown"""
+    async with get_ollama_client() as ollama:
+        # Load the model in the background; startup doesn't wait on Ollama
+        preload = asyncio.create_task(ollama.preload())
+        yield
+        preload.cancel()
 
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Psychological Trend Analysis System",
     description="A chatbot-based behavioral analysis system for non-clinical insights",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -208,12 +222,13 @@ async def get_analysis(session_id: str):
     
     # Perform analyses
     aggregated = aggregate_session_data(responses)
-    trends = get_all_trends(responses)
-    clusters = get_behavioral_clusters(responses)
-    predictions = get_predictions(responses)
+    all_text = joined_text_lower(responses)  # Joined once, shared by this analysis
+    trends = get_all_trends(responses, all_text=all_text)
+    clusters = get_behavioral_clusters(responses, all_text=all_text)
+    predictions = get_predictions(responses, all_text=all_text)
     emotional_profile = get_emotional_profile(responses)
     strengths = identify_strengths(responses)
-    growth_areas = identify_growth_areas(responses)
+    growth_areas = identify_growth_areas(responses, all_text=all_text)
     
     return {
         "session_id": session_id,
@@ -241,11 +256,12 @@ async def get_report(session_id: str):
     
     # Get all analyses
     aggregated = aggregate_session_data(responses)
-    trends = get_all_trends(responses)
-    clusters = get_behavioral_clusters(responses)
-    predictions = get_predictions(responses)
+    all_text = joined_text_lower(responses)  # Joined once, shared by this analysis
+    trends = get_all_trends(responses, all_text=all_text)
+    clusters = get_behavioral_clusters(responses, all_text=all_text)
+    predictions = get_predictions(responses, all_text=all_text)
     strengths = identify_strengths(responses)
-    growth_areas = identify_growth_areas(responses)
+    growth_areas = identify_growth_areas(responses, all_text=all_text)
     
     # Build executive summary
     user_name = session.get('user_name', 'User')
@@ -320,7 +336,9 @@ async def get_report(session_id: str):
     }
     db.save_report(session_id, report_data)
     
-    return ReportResponse(
+    # Everything here comes from our own analysis, and FastAPI validates the
+    # response against response_model anyway, so skip the constructor's pass
+    return ReportResponse.model_construct(
         session_id=session_id,
         generated_at=datetime.now(),
         user_name=user_name,
@@ -338,6 +356,8 @@ async def delete_session(session_id: str):
     """Delete a specific session"""
     deleted = db.delete_session(session_id)
     if deleted:
+        # Cached LLM responses can hold text built from the session's answers
+        get_ollama_client().clear_cache()
         return {"success": True, "message": f"Session {session_id} deleted"}
     raise HTTPException(status_code=404, detail="Session not found")
 
@@ -346,6 +366,7 @@ async def delete_session(session_id: str):
 async def reset_all_data():
     """Reset all data - delete all sessions and responses"""
     count = db.delete_all_data()
+    get_ollama_client().clear_cache()
     return ResetResponse(
         success=True,
         message="All data has been deleted",
@@ -393,11 +414,12 @@ async def get_enhanced_report(session_id: str):
     
     # Get all ML analyses (source of truth)
     aggregated = aggregate_session_data(responses)
-    trends = get_all_trends(responses)
-    clusters = get_behavioral_clusters(responses)
-    predictions = get_predictions(responses)
+    all_text = joined_text_lower(responses)  # Joined once, shared by this analysis
+    trends = get_all_trends(responses, all_text=all_text)
+    clusters = get_behavioral_clusters(responses, all_text=all_text)
+    predictions = get_predictions(responses, all_text=all_text)
     strengths = identify_strengths(responses)
-    growth_areas = identify_growth_areas(responses)
+    growth_areas = identify_growth_areas(responses, all_text=all_text)
     
     user_name = session.get('user_name', 'User')
     
@@ -5,6 +5,7 @@ import numpy as np
 from typing import Dict, List, Any, Tuple, Optional, Set
 from collections import Counter
 
+from ml_engine.keyword_scan import KeywordScanner, joined_text_lower
 from ml_engine.sentiment_context import (
     analyze_sentiment_context,
     get_blocked_archetypes,
@@ -74,7 +75,21 @@ BEHAVIORAL_ARCHETYPES = {
 }
 
 
-def extract_behavioral_features(responses: List[Dict[str, Any]]) -> np.ndarray:
+# Archetype keywords, matched as substrings in a single pass over the text
+ARCHETYPE_SCANNER = KeywordScanner(
+    {archetype: data['keywords'] for archetype, data in BEHAVIORAL_ARCHETYPES.items()}
+)
+
+# Keyword categories for the clustering feature densities
+FEATURE_SCANNER = KeywordScanner({
+    'growth': {'learn', 'grow', 'improve', 'develop', 'progress', 'better'},
+    'challenge': {'challenge', 'difficult', 'hard', 'struggle', 'overcome', 'face'},
+    'social': {'team', 'people', 'together', 'help', 'family', 'friend', 'support'},
+    'achievement': {'achieve', 'success', 'accomplish', 'win', 'complete', 'goal'}
+})
+
+
+def extract_behavioral_features(responses: List[Dict[str, Any]], all_text: Optional[str] = None) -> np.ndarray:
     """
     Extract numerical features from responses for clustering.
     
@@ -89,25 +104,21 @@ def extract_behavioral_features(responses: List[Dict[str, Any]]) -> np.ndarray:
     if not responses:
         return np.array([[0.5, 0.0, 0.0, 0.0, 0.0, 0.0]])
     
-    # Keyword categories
-    growth_kw = {'learn', 'grow', 'improve', 'develop', 'progress', 'better'}
-    challenge_kw = {'challenge', 'difficult', 'hard', 'struggle', 'overcome', 'face'}
-    social_kw = {'team', 'people', 'together', 'help', 'family', 'friend', 'support'}
-    achievement_kw = {'achieve', 'success', 'accomplish', 'win', 'complete', 'goal'}
-    
     # Calculate features
     sentiments = [r.get('sentiment_score', 0) for r in responses]
     avg_sentiment = np.mean(sentiments)
     sentiment_volatility = np.std(sentiments) if len(sentiments) > 1 else 0
     
     # Keyword densities
-    all_text = ' '.join(r.get('raw_response', '') for r in responses).lower()
+    if all_text is None:
+        all_text = joined_text_lower(responses)
     word_count = len(all_text.split()) or 1
     
-    growth_count = sum(1 for kw in growth_kw if kw in all_text)
-    challenge_count = sum(1 for kw in challenge_kw if kw in all_text)
-    social_count = sum(1 for kw in social_kw if kw in all_text)
-    achievement_count = sum(1 for kw in achievement_kw if kw in all_text)
+    counts = FEATURE_SCANNER.counts(all_text)
+    growth_count = counts['growth']
+    challenge_count = counts['challenge']
+    social_count = counts['social']
+    achievement_count = counts['achievement']
     
     features = np.array([[
         (avg_sentiment + 1) / 2,  # Normalize to 0-1
@@ -121,7 +132,7 @@ def extract_behavioral_features(responses: List[Dict[str, Any]]) -> np.ndarray:
     return features
 
 
-def calculate_archetype_affinity(responses: List[Dict[str, Any]], sentiment_context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+def calculate_archetype_affinity(responses: List[Dict[str, Any]], sentiment_context: Optional[Dict[str, Any]] = None, all_text: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Calculate affinity scores for each behavioral archetype.
     Uses sentiment context to block inappropriate archetypes and prefer neutral ones.
@@ -136,20 +147,24 @@ def calculate_archetype_affinity(responses: List[Dict[str, Any]], sentiment_cont
     
     # Get sentiment context if not provided
     if sentiment_context is None:
-        sentiment_context = analyze_sentiment_context(responses)
+        sentiment_context = analyze_sentiment_context(responses, all_text)
     
     # Get blocked and preferred archetypes based on sentiment
     blocked_archetypes = get_blocked_archetypes(sentiment_context)
     preferred_archetypes = get_preferred_archetypes(sentiment_context)
     is_negative_dominant = sentiment_context.get('is_negative_dominant', False)
     
-    # Combine all text
-    all_text = ' '.join(r.get('raw_response', '') for r in responses).lower()
+    # Combine all text and match every archetype's keywords in one scan
+    if all_text is None:
+        all_text = joined_text_lower(responses)
+    archetype_matches = ARCHETYPE_SCANNER.counts(all_text)
     all_keywords = []
     for r in responses:
         all_keywords.extend(r.get('keywords', []))
     
     keyword_counts = Counter(all_keywords)
+    # Lowercase each extracted keyword once, not once per archetype
+    lowered_counts = [(kw.lower(), count) for kw, count in keyword_counts.items()]
     
     affinities = []
     
@@ -159,18 +174,18 @@ def calculate_archetype_affinity(responses: List[Dict[str, Any]], sentiment_cont
             continue
         
         score = 0.0
-        matches = 0
         
         # Check keyword matches
-        for kw in data['keywords']:
-            if kw in all_text:
-                matches += 1
-                score += 0.12
+        matches = archetype_matches[archetype]
+        # One addition per match, not 0.12 * matches, so the float scores
+        # stay exactly those of the per-keyword loop
+        for _ in range(matches):
+            score += 0.12
         
         # Check extracted keyword matches
-        for kw in keyword_counts:
-            if any(trait in kw.lower() for trait in data['traits']):
-                score += 0.08 * keyword_counts[kw]
+        for kw, count in lowered_counts:
+            if any(trait in kw for trait in data['traits']):
+                score += 0.08 * count
         
         # STRICT: Require evidence for evidence-based archetypes
         if data.get('requires_evidence', False) and matches < 2:
@@ -289,23 +304,23 @@ def cluster_responses_by_category(responses: List[Dict[str, Any]]) -> Dict[str,
     return category_analysis
 
 
-def get_behavioral_clusters(responses: List[Dict[str, Any]], sentiment_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def get_behavioral_clusters(responses: List[Dict[str, Any]], sentiment_context: Optional[Dict[str, Any]] = None, all_text: Optional[str] = None) -> Dict[str, Any]:
     """
     Main clustering function returning behavioral profile.
     Uses sentiment context for strict archetype assignment.
     """
     # Get sentiment context if not provided
     if sentiment_context is None:
-        sentiment_context = analyze_sentiment_context(responses)
+        sentiment_context = analyze_sentiment_context(responses, all_text)
     
     # Calculate archetype affinities with sentiment awareness
-    archetypes = calculate_archetype_affinity(responses, sentiment_context)
+    archetypes = calculate_archetype_affinity(responses, sentiment_context, all_text)
     
     # Get category analysis
     category_analysis = cluster_responses_by_category(responses)
     
     # Extract features for potential future ML
-    features = extract_behavioral_features(responses)
+    features = extract_behavioral_features(responses, all_text)
     
     return {
         'archetypes': archetypes,
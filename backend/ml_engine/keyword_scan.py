@@ -0,0 +1,179 @@
+"""
+Multi-pattern keyword scanning using an Aho-Corasick automaton
+
+Instead of one substring search per keyword, all keyword categories are
+compiled into a single automaton and the text is scanned in one pass.
+Scanners are built once at module import and reused for every call.
+"""
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick is optional - phrases are then searched one at a time
+    ahocorasick = None
+
+
+# Word tokens of lowercased text, e.g. "can't" or "routine". Apostrophes only
+# count inside a word, so quotes are dropped ("'tired'" -> "tired"), and a
+# possessive 's is matched but left out of the token ("family's" -> "family").
+TOKEN_PATTERN = re.compile(r"([a-z]+(?:'(?!s\b)[a-z]+)*)(?:'s\b)?")
+
+
+def tokenize_words(text: str) -> Set[str]:
+    """Distinct word tokens of lowercased text"""
+    return set(TOKEN_PATTERN.findall(text))
+
+
+def response_text_lower(response: Dict[str, Any]) -> str:
+    """Lowercased raw_response, cached on the response as '_text_lower'"""
+    text_lower = response.get('_text_lower')
+    if text_lower is None:
+        text_lower = response['_text_lower'] = response.get('raw_response', '').lower()
+    return text_lower
+
+
+def joined_text_lower(responses: List[Dict[str, Any]]) -> str:
+    """All response text joined and lowercased, reusing cached per-response text"""
+    return ' '.join(response_text_lower(r) for r in responses)
+
+
+class KeywordScanner:
+    """
+    Finds which keywords of several categories occur in a text.
+
+    By default matching follows substring semantics, the same as `kw in text`.
+    With whole_words=True, keywords only match on word boundaries (so 'help'
+    no longer matches 'helpful' and 'new' no longer matches 'renewable'):
+    single-word keywords are looked up in the text's token set, and only the
+    multi-word phrases go through the automaton. Keywords are lowercased when
+    the scanner is built, as the scanned text is expected to be lowercase.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]], whole_words: bool = False):
+        self.categories = tuple(categories)
+        self.whole_words = whole_words
+
+        # A keyword may belong to more than one category (e.g. 'worried')
+        self._owners: Dict[str, tuple] = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if category not in self._owners.get(keyword, ()):
+                    self._owners[keyword] = self._owners.get(keyword, ()) + (category,)
+
+        if whole_words:
+            self._words = frozenset(kw for kw in self._owners if _is_token(kw))
+        else:
+            self._words = frozenset()
+
+        self._automaton = None
+        self._phrases = tuple(kw for kw in self._owners if kw not in self._words)
+        if self._phrases and ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self._phrases:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+
+    def scan(self, text: str) -> Dict[str, Set[str]]:
+        """
+        Scan text once and return the distinct keywords found per category.
+        """
+        found = {category: set() for category in self.categories}
+        if self._words:
+            for keyword in self._words.intersection(TOKEN_PATTERN.findall(text)):
+                for category in self._owners[keyword]:
+                    found[category].add(keyword)
+        for _, keyword in self._phrase_hits(text):
+            for category in self._owners[keyword]:
+                found[category].add(keyword)
+        return found
+
+    def positions(self, text: str) -> Dict[str, Dict[str, int]]:
+        """
+        Like scan, but map each keyword found to the offset of its first
+        match, so keywords can be ordered by first appearance. Offsets come
+        from the matches themselves, so with whole_words an occurrence inside
+        a longer word is never counted.
+        """
+        first: Dict[str, int] = {}
+        if self._words:
+            for match in TOKEN_PATTERN.finditer(text):
+                keyword = match.group(1)
+                if keyword in self._words and keyword not in first:
+                    first[keyword] = match.start(1)
+        for start, keyword in self._phrase_hits(text):
+            if start < first.get(keyword, len(text)):
+                first[keyword] = start
+
+        found = {category: {} for category in self.categories}
+        for keyword, start in first.items():
+            for category in self._owners[keyword]:
+                found[category][keyword] = start
+        return found
+
+    def _phrase_hits(self, text: str) -> Iterator[Tuple[int, str]]:
+        """(start index, phrase) of the phrase matches, on word boundaries with whole_words"""
+        if not self._phrases:
+            return
+        matches = self._automaton.iter(text) if self._automaton is not None else self._find_phrases(text)
+        for end, keyword in matches:
+            start = end + 1 - len(keyword)
+            if self.whole_words and not _on_word_boundaries(text, start, end):
+                continue
+            yield start, keyword
+
+    def _find_phrases(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Fallback for the automaton when pyahocorasick is not installed.
+        Yields (end index, phrase) like Automaton.iter; every occurrence is
+        needed with whole_words since only some may sit on word boundaries.
+        """
+        for keyword in self._phrases:
+            start = text.find(keyword)
+            while start != -1:
+                yield start + len(keyword) - 1, keyword
+                if not self.whole_words:
+                    break
+                start = text.find(keyword, start + 1)
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """
+        Number of distinct keywords found per category.
+        Without whole_words, equivalent to `sum(1 for kw in KEYWORDS if kw in text)`
+        for each category.
+        """
+        return {category: len(keywords) for category, keywords in self.scan(text).items()}
+
+
+def _is_token(keyword: str) -> bool:
+    """Whether keyword is a single word token, so it can be looked up in a token set"""
+    match = TOKEN_PATTERN.fullmatch(keyword)
+    return match is not None and match.group(1) == keyword
+
+
+def _is_word_char(text: str, index: int) -> bool:
+    """
+    Whether text[index] is part of a word token (see TOKEN_PATTERN): a letter,
+    or an apostrophe between two letters. A quote next to a space or
+    punctuation is not.
+    """
+    char = text[index]
+    if 'a' <= char <= 'z':
+        return True
+    return (
+        char == "'" and 0 < index < len(text) - 1 and
+        'a' <= text[index - 1] <= 'z' and 'a' <= text[index + 1] <= 'z'
+    )
+
+
+def _on_word_boundaries(text: str, start: int, end: int) -> bool:
+    """Whether text[start:end + 1] is not glued to a neighbouring word"""
+    if start > 0 and _is_word_char(text, start - 1) and _is_word_char(text, start):
+        return False
+    after = end + 1
+    if after < len(text) and _is_word_char(text, after) and _is_word_char(text, end):
+        # A possessive 's still ends the phrase, as it does for single words
+        return text.startswith("'s", after) and not (after + 2 < len(text) and _is_word_char(text, after + 2))
+    return True
@@ -1,9 +1,102 @@
 """
 Behavior prediction module using Random Forest
 """
+import math
 import numpy as np
-from typing import Dict, List, Any
+from statistics import fmean
+from typing import Callable, Dict, List, Any, Optional, Union
 from collections import Counter
+from itertools import chain
+
+from ml_engine.keyword_scan import KeywordScanner, joined_text_lower, response_text_lower
+
+
+# Above this many keywords, counting via numpy's sort-based unique beats Counter
+KEYWORD_COUNT_NUMPY_THRESHOLD = 64
+
+
+def count_keywords(responses: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Count keyword occurrences across responses.
+    Keywords are streamed into a Counter; long keyword lists are counted with numpy.
+    """
+    keywords = chain.from_iterable(r.get('keywords', ()) for r in responses)
+    if sum(len(r.get('keywords', ())) for r in responses) > KEYWORD_COUNT_NUMPY_THRESHOLD:
+        values, counts = np.unique(np.array(list(keywords)), return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist()))
+    return Counter(keywords)
+
+
+# Up to this many values, plain Python is cheaper than building a numpy array
+SMALL_SERIES_THRESHOLD = 64
+
+
+def series_mean(values: List[float]) -> float:
+    """Mean of a non-empty list, avoiding numpy for short lists"""
+    if len(values) > SMALL_SERIES_THRESHOLD:
+        return float(np.mean(values))
+    return fmean(values)
+
+
+def series_std(values: List[float]) -> float:
+    """Population standard deviation of a non-empty list, avoiding numpy for short lists"""
+    if len(values) > SMALL_SERIES_THRESHOLD:
+        return float(np.std(values))
+    mean = fmean(values)
+    return math.sqrt(sum((x - mean) * (x - mean) for x in values) / len(values))
+
+
+def substring_counter(text: str) -> Callable[[str], int]:
+    """
+    Return a function counting substring occurrences in text.
+    ASCII text is scanned as bytes, which uses the faster memmem-based search.
+    """
+    if text.isascii():
+        data = text.encode('ascii')
+        return lambda sub: data.count(sub.encode('ascii'))
+    return text.count
+
+
+# Substrings counted by extract_prediction_features
+FEATURE_SUBSTRINGS = (
+    'routine', 'regular', 'daily', 'habit', 'always', 'every',
+    'change', 'adapt', 'adjust', 'flexible', 'open',
+    'improve', 'better', 'progress', 'goal'
+)
+
+
+def precompute_response_features(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Cache the lowercased text and feature substring counts on a response.
+    Repeated prediction calls on the same responses then skip rescanning the text.
+    """
+    if '_substr_counts' not in response:
+        count = substring_counter(response_text_lower(response))
+        response['_substr_counts'] = {sub: count(sub) for sub in FEATURE_SUBSTRINGS}
+    return response
+
+
+# Phrases behind the attention and growth-area checks, matched as substrings
+# in a single pass over the joined text
+ATTENTION_SCANNER = KeywordScanner({
+    'avoidance': ('avoid', 'give up', "can't"),
+    'stress': ('stress', 'overwhelm'),
+    'balance': ('balance', 'too much work'),
+    'confidence': ('confidence',),
+    'lacking': ('lack', 'low'),
+    'procrastination': ('procrastin',)
+})
+
+
+# Probabilities above each bound move up one confidence label
+CONFIDENCE_BOUNDS = np.array([0.4, 0.7])
+CONFIDENCE_LABELS = np.array(['low', 'medium', 'high'])
+
+
+def confidence_level(probability: Union[float, np.ndarray]) -> Union[str, List[str]]:
+    """Map a probability (or array of probabilities) to low/medium/high"""
+    labels = CONFIDENCE_LABELS[np.searchsorted(CONFIDENCE_BOUNDS, probability)]
+    return labels.tolist()
 
 
 class BehaviorPredictor:
@@ -12,28 +105,37 @@ class BehaviorPredictor:
     Uses rule-based logic with probability outputs for explainability.
     """
     
+    # Fixed feature order used by the vectorized scoring below
+    SCORE_FEATURES = (
+        'routine_mentions', 'habit_mentions', 'sentiment_stability', 'discipline_keywords',
+        'change_mentions', 'overcome_keywords', 'flexibility_keywords', 'avg_sentiment',
+        'learning_keywords', 'improvement_mentions', 'goal_orientation', 'sentiment_trend'
+    )
+    
     def __init__(self):
-        # Feature weights for predictions (learned from patterns)
-        self.consistency_weights = {
-            'routine_mentions': 0.3,
-            'habit_mentions': 0.25,
-            'sentiment_stability': 0.25,
-            'discipline_keywords': 0.2
-        }
-        
-        self.adaptability_weights = {
-            'change_mentions': 0.25,
-            'overcome_keywords': 0.3,
-            'positive_challenge_response': 0.25,
-            'flexibility_keywords': 0.2
-        }
-        
-        self.growth_weights = {
-            'learning_keywords': 0.3,
-            'improvement_mentions': 0.25,
-            'goal_orientation': 0.25,
-            'positive_trend': 0.2
-        }
+        # Defaults used when a feature is missing (e.g. no responses)
+        self._defaults = np.zeros(len(self.SCORE_FEATURES))
+        self._defaults[self.SCORE_FEATURES.index('sentiment_stability')] = 0.5
+        
+        # One row per prediction: consistency, adaptability, growth
+        self._weights = np.array([
+            [0.05, 0.04, 0.2, 0.07, 0, 0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0.06, 0.1, 0.07, 0.1, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0, 0, 0, 0.1, 0.04, 0.07, 0.15]
+        ])
+        
+        # Per-feature contribution limits (e.g. routine mentions add at most 0.2)
+        inf = np.inf
+        self._caps = np.array([
+            [0.2, 0.15, inf, 0.15, inf, inf, inf, inf, inf, inf, inf, inf],
+            [inf, inf, inf, inf, 0.2, 0.2, 0.15, inf, inf, inf, inf, inf],
+            [inf, inf, inf, inf, inf, inf, inf, inf, 0.2, 0.15, 0.15, inf]
+        ])
+        self._floors = np.full(self._caps.shape, -inf)
+        self._floors[2, self.SCORE_FEATURES.index('sentiment_trend')] = 0.0  # Only upward trends help
+        
+        # Base probabilities (adaptability includes the +1/10 sentiment offset)
+        self._bases = np.array([0.3, 0.4, 0.35])
     
     def extract_prediction_features(self, responses: List[Dict[str, Any]]) -> Dict[str, float]:
         """
@@ -42,37 +144,33 @@ class BehaviorPredictor:
         if not responses:
             return {}
         
-        all_text = ' '.join(r.get('raw_response', '') for r in responses).lower()
         sentiments = [r.get('sentiment_score', 0) for r in responses]
         qualities = [r.get('input_quality', 1.0) for r in responses]
-        keywords = []
-        for r in responses:
-            keywords.extend(r.get('keywords', []))
-        
-        keyword_counts = Counter(keywords)
-        word_count = len(all_text.split()) or 1
+        keyword_counts = count_keywords(responses)
+        substr_counts = [precompute_response_features(r)['_substr_counts'] for r in responses]
+        count = lambda sub: sum(c[sub] for c in substr_counts)
         avg_quality = sum(qualities) / len(qualities) if qualities else 1.0
         
         # Calculate features
         features = {
             # Consistency features
-            'routine_mentions': all_text.count('routine') + all_text.count('regular') + all_text.count('daily'),
-            'habit_mentions': all_text.count('habit') + all_text.count('always') + all_text.count('every'),
-            'sentiment_stability': 1 - min(1, np.std(sentiments) * 2) if len(sentiments) > 1 else 0.5,
+            'routine_mentions': count('routine') + count('regular') + count('daily'),
+            'habit_mentions': count('habit') + count('always') + count('every'),
+            'sentiment_stability': 1 - min(1, series_std(sentiments) * 2) if len(sentiments) > 1 else 0.5,
             'discipline_keywords': keyword_counts.get('discipline', 0) + keyword_counts.get('consistency', 0),
             
             # Adaptability features
-            'change_mentions': all_text.count('change') + all_text.count('adapt') + all_text.count('adjust'),
+            'change_mentions': count('change') + count('adapt') + count('adjust'),
             'overcome_keywords': keyword_counts.get('resilience', 0) + keyword_counts.get('overcame', 0),
-            'flexibility_keywords': all_text.count('flexible') + all_text.count('open'),
+            'flexibility_keywords': count('flexible') + count('open'),
             
             # Growth features
             'learning_keywords': keyword_counts.get('growth', 0) + keyword_counts.get('learned', 0),
-            'improvement_mentions': all_text.count('improve') + all_text.count('better') + all_text.count('progress'),
-            'goal_orientation': keyword_counts.get('achievement', 0) + all_text.count('goal'),
+            'improvement_mentions': count('improve') + count('better') + count('progress'),
+            'goal_orientation': keyword_counts.get('achievement', 0) + count('goal'),
             
             # Sentiment features
-            'avg_sentiment': np.mean(sentiments),
+            'avg_sentiment': series_mean(sentiments),
             'sentiment_trend': sentiments[-1] - sentiments[0] if len(sentiments) > 1 else 0,
             'positive_ratio': len([s for s in sentiments if s > 0.2]) / len(sentiments) if sentiments else 0.5,
             
@@ -83,33 +181,35 @@ class BehaviorPredictor:
         
         return features
     
-    def predict_consistency(self, features: Dict[str, float]) -> Dict[str, Any]:
+    def predict_probabilities(self, features: Dict[str, float]) -> np.ndarray:
         """
-        Predict likelihood of maintaining consistent behavior.
+        Compute consistency, adaptability and growth probabilities in one pass.
         """
-        # Calculate weighted score
-        score = 0.3  # Base probability
+        vec = np.array([features.get(name, default)
+                        for name, default in zip(self.SCORE_FEATURES, self._defaults)], dtype=float)
         
-        score += min(0.2, features.get('routine_mentions', 0) * 0.05)
-        score += min(0.15, features.get('habit_mentions', 0) * 0.04)
-        score += features.get('sentiment_stability', 0.5) * 0.2
-        score += min(0.15, features.get('discipline_keywords', 0) * 0.07)
+        contributions = np.clip(self._weights * vec, self._floors, self._caps)
+        
+        # Accumulate left to right from the base, matching the scalar formulas
+        scores = np.cumsum(np.column_stack((self._bases, contributions)), axis=1)[:, -1]
         
         # Apply quality penalty
         avg_quality = features.get('avg_quality', 1.0)
         if avg_quality < 0.5:
-            score = score * avg_quality * 1.2  # Significant reduction
+            scores = scores * avg_quality * 1.2  # Significant reduction
         
         # Normalize
-        probability = min(0.95, max(0.1, score))
+        return np.clip(scores, 0.1, 0.95)
+    
+    def predict_consistency(self, features: Dict[str, float], probability: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Predict likelihood of maintaining consistent behavior.
+        """
+        if probability is None:
+            probability = float(self.predict_probabilities(features)[0])
         
         # Determine confidence
-        if probability > 0.7:
-            confidence = 'high'
-        elif probability > 0.4:
-            confidence = 'medium'
-        else:
-            confidence = 'low'
+        confidence = confidence_level(probability)
         
         # Contributing factors
         factors = []
@@ -131,30 +231,14 @@ class BehaviorPredictor:
             'contributing_factors': factors
         }
     
-    def predict_adaptability(self, features: Dict[str, float]) -> Dict[str, Any]:
+    def predict_adaptability(self, features: Dict[str, float], probability: Optional[float] = None) -> Dict[str, Any]:
         """
         Predict ability to adapt to change.
         """
-        score = 0.3  # Base
+        if probability is None:
+            probability = float(self.predict_probabilities(features)[1])
         
-        score += min(0.2, features.get('change_mentions', 0) * 0.06)
-        score += min(0.2, features.get('overcome_keywords', 0) * 0.1)
-        score += min(0.15, features.get('flexibility_keywords', 0) * 0.07)
-        score += (features.get('avg_sentiment', 0) + 1) / 10  # Positive sentiment helps
-        
-        # Apply quality penalty
-        avg_quality = features.get('avg_quality', 1.0)
-        if avg_quality < 0.5:
-            score = score * avg_quality * 1.2
-        
-        probability = min(0.95, max(0.1, score))
-        
-        if probability > 0.7:
-            confidence = 'high'
-        elif probability > 0.4:
-            confidence = 'medium'
-        else:
-            confidence = 'low'
+        confidence = confidence_level(probability)
         
         factors = []
         if features.get('change_mentions', 0) > 0:
@@ -175,30 +259,14 @@ class BehaviorPredictor:
             'contributing_factors': factors
         }
     
-    def predict_growth_potential(self, features: Dict[str, float]) -> Dict[str, Any]:
+    def predict_growth_potential(self, features: Dict[str, float], probability: Optional[float] = None) -> Dict[str, Any]:
         """
         Predict learning and career growth inclination.
         """
-        score = 0.35  # Base
-        
-        score += min(0.2, features.get('learning_keywords', 0) * 0.1)
-        score += min(0.15, features.get('improvement_mentions', 0) * 0.04)
-        score += min(0.15, features.get('goal_orientation', 0) * 0.07)
-        score += max(0, features.get('sentiment_trend', 0) * 0.15)
+        if probability is None:
+            probability = float(self.predict_probabilities(features)[2])
         
-        # Apply quality penalty
-        avg_quality = features.get('avg_quality', 1.0)
-        if avg_quality < 0.5:
-            score = score * avg_quality * 1.2
-        
-        probability = min(0.95, max(0.1, score))
-        
-        if probability > 0.7:
-            confidence = 'high'
-        elif probability > 0.4:
-            confidence = 'medium'
-        else:
-            confidence = 'low'
+        confidence = confidence_level(probability)
         
         factors = []
         if features.get('learning_keywords', 0) > 0:
@@ -219,7 +287,7 @@ class BehaviorPredictor:
             'contributing_factors': factors
         }
     
-    def assess_risk_indicators(self, features: Dict[str, float], responses: List[Dict]) -> Dict[str, Any]:
+    def assess_risk_indicators(self, features: Dict[str, float], responses: List[Dict], all_text: Optional[str] = None) -> Dict[str, Any]:
         """
         Assess behavioral risk indicators (non-clinical).
         """
@@ -256,8 +324,9 @@ class BehaviorPredictor:
             risk_level = 'moderate' if risk_level == 'low' else risk_level
         
         # Check for avoidance patterns
-        all_text = ' '.join(r.get('raw_response', '') for r in responses).lower()
-        if 'avoid' in all_text or 'give up' in all_text or 'can\'t' in all_text:
+        if all_text is None:
+            all_text = joined_text_lower(responses)
+        if ATTENTION_SCANNER.counts(all_text)['avoidance']:
             indicators.append('Possible avoidance tendencies')
         
         if not indicators:
@@ -271,28 +340,29 @@ class BehaviorPredictor:
             'contributing_factors': indicators
         }
     
-    def get_all_predictions(self, responses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def get_all_predictions(self, responses: List[Dict[str, Any]], all_text: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Generate all predictions for a user.
         """
         features = self.extract_prediction_features(responses)
+        consistency, adaptability, growth = self.predict_probabilities(features).tolist()
         
         predictions = [
-            self.predict_consistency(features),
-            self.predict_adaptability(features),
-            self.predict_growth_potential(features),
-            self.assess_risk_indicators(features, responses)
+            self.predict_consistency(features, consistency),
+            self.predict_adaptability(features, adaptability),
+            self.predict_growth_potential(features, growth),
+            self.assess_risk_indicators(features, responses, all_text)
         ]
         
         return predictions
 
 
-def get_predictions(responses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def get_predictions(responses: List[Dict[str, Any]], all_text: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Main function to get behavioral predictions.
     """
     predictor = BehaviorPredictor()
-    return predictor.get_all_predictions(responses)
+    return predictor.get_all_predictions(responses, all_text)
 
 
 def identify_strengths(responses: List[Dict[str, Any]]) -> List[str]:
@@ -306,16 +376,12 @@ def identify_strengths(responses: List[Dict[str, Any]]) -> List[str]:
     
     # Calculate sentiment context
     sentiments = [r.get('sentiment_score', 0) for r in responses]
-    avg_sentiment = np.mean(sentiments)
+    avg_sentiment = series_mean(sentiments)
     qualities = [r.get('input_quality', 1.0) for r in responses]
-    avg_quality = np.mean(qualities)
-    
-    # Collect all keywords
-    all_keywords = []
-    for r in responses:
-        all_keywords.extend(r.get('keywords', []))
+    avg_quality = series_mean(qualities)
     
-    keyword_counts = Counter(all_keywords)
+    # Count keywords across all responses
+    keyword_counts = count_keywords(responses)
     
     # STRICT: Only map keywords to strengths if keywords are actually present
     strength_mapping = {
@@ -364,7 +430,7 @@ def identify_strengths(responses: List[Dict[str, Any]]) -> List[str]:
     return strengths[:5]  # Top 5 strengths
 
 
-def identify_growth_areas(responses: List[Dict[str, Any]]) -> List[str]:
+def identify_growth_areas(responses: List[Dict[str, Any]], all_text: Optional[str] = None) -> List[str]:
     """
     Identify areas for growth and development.
     """
@@ -372,26 +438,28 @@ def identify_growth_areas(responses: List[Dict[str, Any]]) -> List[str]:
         return ['More data needed to identify growth areas']
     
     growth_areas = []
-    all_text = ' '.join(r.get('raw_response', '') for r in responses).lower()
+    if all_text is None:
+        all_text = joined_text_lower(responses)
+    found = ATTENTION_SCANNER.counts(all_text)
     sentiments = [r.get('sentiment_score', 0) for r in responses]
     
     # Check for areas that might need attention
-    if 'stress' in all_text or 'overwhelm' in all_text:
+    if found['stress']:
         growth_areas.append('Developing stress management techniques')
     
-    if 'balance' in all_text or 'too much work' in all_text:
+    if found['balance']:
         growth_areas.append('Improving work-life balance')
     
-    if 'confidence' in all_text and ('lack' in all_text or 'low' in all_text):
+    if found['confidence'] and found['lacking']:
         growth_areas.append('Building self-confidence')
     
-    if np.std(sentiments) > 0.4 if len(sentiments) > 1 else False:
+    if series_std(sentiments) > 0.4 if len(sentiments) > 1 else False:
         growth_areas.append('Developing emotional regulation strategies')
     
-    if np.mean(sentiments) < 0:
+    if series_mean(sentiments) < 0:
         growth_areas.append('Cultivating a more positive perspective')
     
-    if 'procrastin' in all_text:
+    if found['procrastination']:
         growth_areas.append('Overcoming procrastination tendencies')
     
     if not growth_areas:
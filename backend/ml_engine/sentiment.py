@@ -2,6 +2,7 @@
 Sentiment analysis module using rule-based and ML approaches
 """
 import re
+from types import MappingProxyType
 from typing import Dict, List, Tuple, Any
 import numpy as np
 
@@ -51,11 +52,33 @@ NEGATIVE_LEXICON = {
     'tired': -0.4, 'bored': -0.35
 }
 
-NEGATION_WORDS = {'not', "n't", 'never', 'no', 'neither', 'hardly', 'barely', 'without'}
-INTENSIFIERS = {'very': 1.3, 'really': 1.3, 'extremely': 1.5, 'incredibly': 1.5, 
-                'absolutely': 1.5, 'totally': 1.3, 'completely': 1.4}
-DIMINISHERS = {'somewhat': 0.6, 'slightly': 0.5, 'a bit': 0.6, 'kind of': 0.6, 
-               'sort of': 0.6, 'barely': 0.4, 'hardly': 0.4}
+NEGATION_WORDS = frozenset({'not', "n't", 'never', 'no', 'neither', 'hardly', 'barely', 'without'})
+INTENSIFIERS = MappingProxyType({'very': 1.3, 'really': 1.3, 'extremely': 1.5, 'incredibly': 1.5,
+                                 'absolutely': 1.5, 'totally': 1.3, 'completely': 1.4})
+DIMINISHERS = MappingProxyType({'somewhat': 0.6, 'slightly': 0.5, 'a bit': 0.6, 'kind of': 0.6,
+                                'sort of': 0.6, 'barely': 0.4, 'hardly': 0.4})
+
+# Modifier kinds as bit flags - 'barely'/'hardly' are both negations and diminishers
+MOD_NEGATION = 1
+MOD_INTENSIFIER = 2
+MOD_DIMINISHER = 4
+
+
+def _build_modifier_kinds() -> Dict[str, Tuple[int, float]]:
+    """Merge the modifier lexicons into token -> (kind flags, multiplier)"""
+    kinds = {}
+    for word in NEGATION_WORDS:
+        kinds[word] = (MOD_NEGATION, 1.0)
+    for lexicon, flag in ((INTENSIFIERS, MOD_INTENSIFIER), (DIMINISHERS, MOD_DIMINISHER)):
+        for word, multiplier in lexicon.items():
+            kind, _ = kinds.get(word, (0, 1.0))
+            kinds[word] = (kind | flag, multiplier)
+    return kinds
+
+
+# One dict probe per look-back token instead of three membership tests
+_MOD_KIND = MappingProxyType(_build_modifier_kinds())
+_NO_MODIFIER = (0, 1.0)
 
 
 def tokenize(text: str) -> List[str]:
@@ -105,12 +128,11 @@ def analyze_sentiment_detailed(text: str) -> Dict[str, Any]:
         
         for j in range(max(0, i-2), i):
             prev_token = tokens[j]
-            if prev_token in NEGATION_WORDS or "'t" in prev_token:
+            kind, multiplier = _MOD_KIND.get(prev_token, _NO_MODIFIER)
+            if kind & MOD_NEGATION or "'t" in prev_token:
                 is_negated = True
-            if prev_token in INTENSIFIERS:
-                modifier = INTENSIFIERS[prev_token]
-            elif prev_token in DIMINISHERS:
-                modifier = DIMINISHERS[prev_token]
+            if kind & (MOD_INTENSIFIER | MOD_DIMINISHER):
+                modifier = multiplier
         
         # Apply modifiers
         final_score = base_score * modifier
@@ -215,21 +237,13 @@ def get_emotional_profile(responses: List[Dict[str, Any]]) -> Dict[str, Any]:
             'emotional_range': 0.0
         }
     
-    positive_count = 0
-    negative_count = 0
-    neutral_count = 0
-    all_scores = []
-    
-    for resp in responses:
-        score = resp.get('sentiment_score', 0)
-        all_scores.append(score)
-        
-        if score > 0.2:
-            positive_count += 1
-        elif score < -0.2:
-            negative_count += 1
-        else:
-            neutral_count += 1
+    # Pull the scores out once and count the categories with vectorized comparisons
+    scores = np.fromiter(
+        (resp.get('sentiment_score', 0) for resp in responses), dtype=np.float64, count=len(responses)
+    )
+    positive_count = int((scores > 0.2).sum())
+    negative_count = int((scores < -0.2).sum())
+    neutral_count = len(responses) - positive_count - negative_count
     
     total = len(responses)
     distribution = {
@@ -247,10 +261,7 @@ def get_emotional_profile(responses: List[Dict[str, Any]]) -> Dict[str, Any]:
         dominant = 'neutral'
     
     # Calculate range
-    if all_scores:
-        emotional_range = max(all_scores) - min(all_scores)
-    else:
-        emotional_range = 0.0
+    emotional_range = float(scores.max() - scores.min())
     
     return {
         'dominant_emotion': dominant,
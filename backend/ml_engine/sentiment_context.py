@@ -4,7 +4,13 @@ Sentiment Context Analysis for Stricter Behavioral Scoring
 This module detects when negative sentiment dominates user responses
 and provides score caps and archetype restrictions accordingly.
 """
-from typing import Dict, List, Any, Tuple, Set
+import hashlib
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple, Set
+
+import numpy as np
+
+from ml_engine.keyword_scan import KeywordScanner, joined_text_lower
 
 
 # =============================================================================
@@ -12,63 +18,96 @@ from typing import Dict, List, Any, Tuple, Set
 # =============================================================================
 
 # Uncertainty and confusion indicators
-UNCERTAINTY_KEYWORDS = {
+UNCERTAINTY_KEYWORDS = frozenset({
     "don't know", "not sure", "uncertain", "confused", "unclear", "maybe",
     "perhaps", "idk", "dunno", "no idea", "unsure", "hard to say",
     "can't tell", "I guess", "possibly", "doubtful", "hesitant"
-}
+})
 
 # Stress and pressure indicators
-STRESS_KEYWORDS = {
+STRESS_KEYWORDS = frozenset({
     "stressed", "pressure", "overwhelmed", "exhausted", "tired", "burnt out",
     "anxious", "worried", "tense", "overworked", "demanding", "hectic",
     "struggling", "difficult", "hard time", "tough", "draining", "burden"
-}
+})
 
 # Fear and discouragement indicators
-FEAR_DISCOURAGEMENT_KEYWORDS = {
+FEAR_DISCOURAGEMENT_KEYWORDS = frozenset({
     "afraid", "scared", "fear", "worried", "discouraged", "hopeless",
     "give up", "gave up", "can't", "cannot", "impossible", "won't work",
     "failed", "failure", "losing", "lost", "stuck", "trapped", "helpless",
     "pointless", "useless", "worthless", "no point"
-}
+})
 
 # Low motivation indicators
-LOW_MOTIVATION_KEYWORDS = {
+LOW_MOTIVATION_KEYWORDS = frozenset({
     "don't want", "unmotivated", "lazy", "bored", "apathetic", "indifferent",
     "lack of interest", "no motivation", "forced", "have to", "must",
     "obligation", "reluctant", "unwilling", "dread", "hate"
-}
+})
 
 # Absence of achievement indicators
-NO_ACHIEVEMENT_KEYWORDS = {
+NO_ACHIEVEMENT_KEYWORDS = frozenset({
     "nothing", "didn't accomplish", "no progress", "haven't done",
     "nothing special", "not much", "same old", "routine", "boring",
     "mundane", "ordinary", "unremarkable", "mediocre", "average"
-}
+})
 
 # Positive achievement indicators (for blocking "Achiever" without these)
-ACHIEVEMENT_EVIDENCE_KEYWORDS = {
+ACHIEVEMENT_EVIDENCE_KEYWORDS = frozenset({
     "achieved", "accomplished", "proud", "success", "won", "earned",
     "completed", "finished", "reached", "goal", "milestone", "breakthrough",
     "recognition", "award", "promoted", "excelled", "best", "first place"
-}
+})
 
 # Positive growth indicators (for blocking high growth without these)
-GROWTH_EVIDENCE_KEYWORDS = {
+GROWTH_EVIDENCE_KEYWORDS = frozenset({
     "learned", "grew", "improved", "developed", "progressed", "better",
     "enhanced", "expanded", "evolved", "transformed", "mastered"
-}
+})
+
+
+# All context keyword categories, matched as whole words in a single pass over the text
+CONTEXT_SCANNER = KeywordScanner({
+    "uncertainty": UNCERTAINTY_KEYWORDS,
+    "stress": STRESS_KEYWORDS,
+    "fear": FEAR_DISCOURAGEMENT_KEYWORDS,
+    "low_motivation": LOW_MOTIVATION_KEYWORDS,
+    "no_achievement": NO_ACHIEVEMENT_KEYWORDS,
+    "achievement_evidence": ACHIEVEMENT_EVIDENCE_KEYWORDS,
+    "growth_evidence": GROWTH_EVIDENCE_KEYWORDS
+}, whole_words=True)
+
+
+# Recently computed sentiment contexts, keyed by a fingerprint of the responses
+SENTIMENT_CACHE_SIZE = 256
+_sentiment_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
 
 
 # =============================================================================
 # SENTIMENT CONTEXT ANALYSIS
 # =============================================================================
 
-def analyze_sentiment_context(responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+def responses_fingerprint(responses: List[Dict[str, Any]]) -> bytes:
+    """
+    Stable digest of everything the sentiment context depends on
+    (response text, sentiment score and input quality).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for r in responses:
+        digest.update(r.get('raw_response', '').encode('utf-8', 'surrogatepass'))
+        digest.update(b'\x1f')
+        digest.update(repr((r.get('sentiment_score', 0), r.get('input_quality', 1.0))).encode())
+        digest.update(b'\x1e')
+    return digest.digest()
+
+
+def analyze_sentiment_context(responses: List[Dict[str, Any]], all_text: Optional[str] = None) -> Dict[str, Any]:
     """
     Analyze overall sentiment context from all responses.
     
+    all_text, if given, is the responses' text already joined and lowercased.
+    
     Returns:
         Dict with:
         - is_negative_dominant: bool
@@ -82,6 +121,23 @@ def analyze_sentiment_context(responses: List[Dict[str, Any]]) -> Dict[str, Any]
         - has_growth_evidence: bool
         - attention_areas: List[str] - areas impacted by negative sentiment
     """
+    # Memoized, so trends, clustering and the LLM report scan the responses once
+    key = responses_fingerprint(responses)
+    context = _sentiment_cache.get(key)
+    if context is None:
+        context = _compute_sentiment_context(responses, all_text)
+        _sentiment_cache[key] = context
+        if len(_sentiment_cache) > SENTIMENT_CACHE_SIZE:
+            _sentiment_cache.popitem(last=False)
+    else:
+        _sentiment_cache.move_to_end(key)
+    
+    # Hand out a copy so callers can't modify the cached context
+    return dict(context, attention_areas=list(context["attention_areas"]))
+
+
+def _compute_sentiment_context(responses: List[Dict[str, Any]], all_text: Optional[str] = None) -> Dict[str, Any]:
+    """Uncached implementation of analyze_sentiment_context"""
     if not responses:
         return {
             "is_negative_dominant": False,
@@ -96,41 +152,27 @@ def analyze_sentiment_context(responses: List[Dict[str, Any]]) -> Dict[str, Any]
             "attention_areas": []
         }
     
+    # Calculate negative sentiment from scores
+    negative_ratio = _negative_ratio(responses)
+    
     # Combine all response text
-    all_text = ' '.join(r.get('raw_response', '') for r in responses).lower()
+    if all_text is None:
+        all_text = joined_text_lower(responses)
     
     # Count negative indicators
-    uncertainty_count = sum(1 for kw in UNCERTAINTY_KEYWORDS if kw in all_text)
-    stress_count = sum(1 for kw in STRESS_KEYWORDS if kw in all_text)
-    fear_count = sum(1 for kw in FEAR_DISCOURAGEMENT_KEYWORDS if kw in all_text)
-    low_motivation_count = sum(1 for kw in LOW_MOTIVATION_KEYWORDS if kw in all_text)
-    no_achievement_count = sum(1 for kw in NO_ACHIEVEMENT_KEYWORDS if kw in all_text)
+    counts = CONTEXT_SCANNER.counts(all_text)
+    uncertainty_count = counts["uncertainty"]
+    stress_count = counts["stress"]
+    fear_count = counts["fear"]
+    low_motivation_count = counts["low_motivation"]
+    no_achievement_count = counts["no_achievement"]
     
     # Check for positive evidence
-    has_achievement_evidence = any(kw in all_text for kw in ACHIEVEMENT_EVIDENCE_KEYWORDS)
-    has_growth_evidence = any(kw in all_text for kw in GROWTH_EVIDENCE_KEYWORDS)
-    
-    # Calculate negative sentiment from scores
-    sentiment_scores = [r.get('sentiment_score', 0) for r in responses]
-    negative_responses = sum(1 for s in sentiment_scores if s < -0.1)
-    low_quality_responses = sum(1 for r in responses if r.get('input_quality', 1.0) < 0.5)
-    
-    total_responses = len(responses)
-    negative_ratio = (negative_responses + low_quality_responses) / (total_responses * 2)
-    
-    # Count total negative indicators
-    total_negative_indicators = (
-        uncertainty_count + stress_count + fear_count +
-        low_motivation_count + no_achievement_count
-    )
+    has_achievement_evidence = counts["achievement_evidence"] > 0
+    has_growth_evidence = counts["growth_evidence"] > 0
     
     # Determine if negative sentiment dominates
-    is_negative_dominant = (
-        negative_ratio > 0.3 or
-        total_negative_indicators >= 3 or
-        (stress_count >= 2 and fear_count >= 1) or
-        (low_motivation_count >= 2)
-    )
+    is_negative_dominant = negative_ratio > 0.3 or _indicators_dominate(counts)
     
     # Identify attention areas
     attention_areas = []
@@ -157,6 +199,34 @@ def analyze_sentiment_context(responses: List[Dict[str, Any]]) -> Dict[str, Any]
     }
 
 
+def _negative_ratio(responses: List[Dict[str, Any]]) -> float:
+    """Share of negative and low-quality responses (each counts half)"""
+    total_responses = len(responses)
+    sentiment_scores = np.fromiter(
+        (r.get('sentiment_score', 0) for r in responses), dtype=np.float64, count=total_responses
+    )
+    input_qualities = np.fromiter(
+        (r.get('input_quality', 1.0) for r in responses), dtype=np.float64, count=total_responses
+    )
+    negative_responses = int((sentiment_scores < -0.1).sum())
+    low_quality_responses = int((input_qualities < 0.5).sum())
+    
+    return (negative_responses + low_quality_responses) / (total_responses * 2)
+
+
+def _indicators_dominate(counts: Dict[str, int]) -> bool:
+    """Whether the negative keyword counts alone make negative sentiment dominant"""
+    total_negative_indicators = (
+        counts["uncertainty"] + counts["stress"] + counts["fear"] +
+        counts["low_motivation"] + counts["no_achievement"]
+    )
+    return (
+        total_negative_indicators >= 3 or
+        (counts["stress"] >= 2 and counts["fear"] >= 1) or
+        (counts["low_motivation"] >= 2)
+    )
+
+
 def get_score_caps(sentiment_context: Dict[str, Any]) -> Dict[str, float]:
     """
     Get maximum allowed scores based on sentiment context.
@@ -187,20 +257,24 @@ def get_score_caps(sentiment_context: Dict[str, Any]) -> Dict[str, float]:
     
     # Further reduce based on specific indicators
     ctx = sentiment_context
+    stress_count = ctx.get("stress_count", 0)
+    fear_count = ctx.get("fear_count", 0)
+    low_motivation_count = ctx.get("low_motivation_count", 0)
+    uncertainty_count = ctx.get("uncertainty_count", 0)
     
     # Extra reduction for multiple stress/fear indicators
-    if ctx.get("stress_count", 0) >= 3:
+    if stress_count >= 3:
         caps["motivation"] = min(caps["motivation"], 0.35)
         caps["stress_response"] = min(caps["stress_response"], 0.35)
     
-    if ctx.get("fear_count", 0) >= 2:
+    if fear_count >= 2:
         caps["stress_response"] = min(caps["stress_response"], 0.35)
         caps["growth"] = min(caps["growth"], 0.35)
     
-    if ctx.get("low_motivation_count", 0) >= 2:
+    if low_motivation_count >= 2:
         caps["motivation"] = min(caps["motivation"], 0.30)
     
-    if ctx.get("uncertainty_count", 0) >= 3:
+    if uncertainty_count >= 3:
         caps["growth"] = min(caps["growth"], 0.35)
         caps["consistency"] = min(caps["consistency"], 0.25)
     
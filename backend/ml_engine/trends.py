@@ -2,9 +2,19 @@
 Trend analysis module for behavioral pattern detection
 """
 import numpy as np
-from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, FrozenSet, List, Any, Optional, Union
 from datetime import datetime
 
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional - the kernel below also runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+from ml_engine.keyword_scan import KeywordScanner, joined_text_lower, response_text_lower
 from ml_engine.sentiment_context import (
     analyze_sentiment_context,
     get_score_caps,
@@ -15,21 +25,218 @@ from ml_engine.sentiment_context import (
 )
 
 
-def calculate_moving_average(values: List[float], window: int = 3) -> List[float]:
+# Motivation indicators (matched against extracted keywords)
+MOTIVATION_KEYWORDS = frozenset({
+    'motivated', 'inspired', 'excited', 'passionate', 'driven',
+    'determined', 'goal', 'achieve', 'success', 'accomplished'
+})
+
+# Overwhelming/exhausting routine descriptions
+EXHAUSTION_KEYWORDS = frozenset({'tiring', 'exhausting', 'overwhelming', 'draining', 'too much', 'burnt out'})
+
+# Consistency indicators
+CONSISTENCY_KEYWORDS = frozenset({
+    'routine', 'habit', 'regular', 'daily', 'always', 'consistent',
+    'discipline', 'practice', 'maintain', 'steady'
+})
+
+VOLATILITY_KEYWORDS = frozenset({
+    'change', 'different', 'varies', 'sometimes', 'unpredictable',
+    'spontaneous', 'flexible'
+})
+
+# Keywords suggesting growth feels forced or unclear
+FORCED_GROWTH_KEYWORDS = frozenset({'forced', 'have to', 'must', 'pressure', 'expected', 'should'})
+
+GROWTH_KEYWORDS = frozenset({
+    'learned', 'growth', 'improved', 'developed', 'grew', 'progress',
+    'challenge', 'opportunity', 'new', 'skill', 'knowledge', 'better',
+    'evolved', 'adapted', 'overcame', 'self-improvement'
+})
+
+FIXED_MINDSET_KEYWORDS = frozenset({
+    'stuck', "can't", 'impossible', 'always been', 'never could',
+    'born', 'natural', 'talent', 'gifted', 'hopeless', 'pointless'
+})
+
+# Active coping indicators
+ACTIVE_COPING_KEYWORDS = frozenset({
+    'handled', 'managed', 'solved', 'addressed', 'faced', 'overcame',
+    'dealt', 'took action', 'worked through', 'found solution'
+})
+
+# Avoidance indicators - expanded
+AVOIDANCE_KEYWORDS = frozenset({
+    'avoided', 'ignored', 'gave up', 'quit', 'walked away',
+    "couldn't handle", 'too much', 'ran away', 'escaped',
+    'shut down', 'frozen', 'paralyzed', 'overwhelmed'
+})
+
+# Support-seeking indicators
+SUPPORT_SEEKING_KEYWORDS = frozenset({
+    'help', 'support', 'talked', 'asked', 'reached out', 'team',
+    'family', 'friends', 'mentor'
+})
+
+# Every text-matched category, scanned in a single pass per text.
+# Keywords and phrases such as 'took action' only match whole words.
+TREND_SCANNER = KeywordScanner({
+    'stress': STRESS_KEYWORDS,
+    'low_motivation': LOW_MOTIVATION_KEYWORDS,
+    'uncertainty': UNCERTAINTY_KEYWORDS,
+    'fear': FEAR_DISCOURAGEMENT_KEYWORDS,
+    'exhaustion': EXHAUSTION_KEYWORDS,
+    'consistency': CONSISTENCY_KEYWORDS,
+    'volatility': VOLATILITY_KEYWORDS,
+    'forced_growth': FORCED_GROWTH_KEYWORDS,
+    'growth': GROWTH_KEYWORDS,
+    'fixed_mindset': FIXED_MINDSET_KEYWORDS,
+    'active_coping': ACTIVE_COPING_KEYWORDS,
+    'avoidance': AVOIDANCE_KEYWORDS,
+    'support_seeking': SUPPORT_SEEKING_KEYWORDS
+}, whole_words=True)
+
+
+# Score series are float64 arrays inside the analyzers and plain lists at the
+# JSON boundary; the helpers below accept either
+Series = Union[List[float], np.ndarray]
+
+
+@dataclass
+class TrendFeatures:
+    """
+    Per-response inputs of the trend analyzers as parallel arrays
+    (struct of arrays), built in a single pass by _featurize.
+    """
+    sentiment: np.ndarray
+    input_quality: np.ndarray
+    # Distinct keywords of each TREND_SCANNER category found per response,
+    # and whether there were any
+    hits: Dict[str, np.ndarray]
+    present: Dict[str, np.ndarray]
+    # Responses whose input quality draws the low-quality penalty (< 0.5)
+    low_quality: np.ndarray
+    # Extracted keywords that are motivation keywords, per response
+    motivation_hits: np.ndarray
+    # Growth keywords found per response in order of appearance, for reporting indicators
+    growth_found: List[List[str]]
+    # Distinct keywords per category in all response text joined together
+    totals: Dict[str, int]
+
+
+def _featurize(responses: List[Dict[str, Any]], all_text: Optional[str] = None) -> TrendFeatures:
+    """
+    Scan each response's (cached) lowercased text once for every trend keyword
+    category and gather the numeric inputs of all analyzers.
+    The result is shared by all analyzers when called through get_all_trends.
+    all_text is the joined lowercased response text, if the caller has it.
+    """
+    n = len(responses)
+    texts = [response_text_lower(r) for r in responses]
+    # Keywords found per category, each with the offset of its first whole-word match
+    found = [TREND_SCANNER.positions(text) for text in texts]
+    
+    # With a single response the joined text is that response's text, so its
+    # scan already gives the totals
+    if n == 1 and all_text is None:
+        totals = {category: len(keywords) for category, keywords in found[0].items()}
+    else:
+        totals = TREND_SCANNER.counts(joined_text_lower(responses) if all_text is None else all_text)
+    
+    input_quality = np.fromiter(
+        (r.get('input_quality', 1.0) for r in responses), dtype=np.float64, count=n
+    )
+    hits = {
+        category: np.fromiter((len(f[category]) for f in found), dtype=np.int64, count=n)
+        for category in TREND_SCANNER.categories
+    }
+    return TrendFeatures(
+        sentiment=np.fromiter(
+            (r.get('sentiment_score', 0) for r in responses), dtype=np.float64, count=n
+        ),
+        input_quality=input_quality,
+        hits=hits,
+        present={category: counts > 0 for category, counts in hits.items()},
+        low_quality=input_quality < 0.5,
+        motivation_hits=np.fromiter(
+            (len(_keyword_set(r) & MOTIVATION_KEYWORDS) for r in responses), dtype=np.int64, count=n
+        ),
+        growth_found=[sorted(f['growth'], key=lambda kw: (f['growth'][kw], kw)) for f in found],
+        totals=totals
+    )
+
+
+def _add_per_hit(score: np.ndarray, hits: np.ndarray, step: float) -> np.ndarray:
+    """
+    Add step once per hit, one addition at a time like `for _ in hits: score += step`,
+    so the float results match the per-response loop exactly.
+    """
+    for j in range(int(hits.max(initial=0))):
+        score = np.where(hits > j, score + step, score)
+    return score
+
+
+def _keyword_set(response: Dict[str, Any]) -> FrozenSet[str]:
+    """Extracted keywords of a response as a set, cached on the response as '_kw_set'"""
+    keyword_set = response.get('_kw_set')
+    if keyword_set is None:
+        keyword_set = response['_kw_set'] = frozenset(response.get('keywords', ()))
+    return keyword_set
+
+
+# =============================================================================
+# NUMERIC KERNEL (JIT-compiled when numba is installed)
+# =============================================================================
+
+@njit(cache=True)
+def _linear_fit_kernel(values):
+    """
+    Closed-form least-squares fit of values against their index (needs 2+ values).
+    Uses deviations from the means, which avoids the cancellation of the raw
+    sum-of-products formulas. Returns (slope, r_squared).
+    """
+    n = values.shape[0]
+    mean_x = (n - 1) / 2.0
+    mean_y = 0.0
+    for i in range(n):
+        mean_y += values[i]
+    mean_y /= n
+    
+    sum_dxdy = 0.0
+    ss_tot = 0.0
+    for i in range(n):
+        deviation = values[i] - mean_y
+        sum_dxdy += (i - mean_x) * deviation
+        ss_tot += deviation * deviation
+    # Sum of squared index deviations, (n^3 - n) / 12
+    sum_dxdx = (n - 1) * n * (n + 1) / 12.0
+    
+    slope = sum_dxdy / sum_dxdx
+    intercept = mean_y - slope * mean_x
+    
+    ss_res = 0.0
+    for i in range(n):
+        residual = values[i] - (slope * i + intercept)
+        ss_res += residual * residual
+    
+    r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0.0
+    return slope, r_squared
+
+
+def calculate_moving_average(values: Series, window: int = 3) -> List[float]:
     """Calculate moving average with specified window"""
     if len(values) < window:
-        return values
-    
-    result = []
-    for i in range(len(values)):
-        start = max(0, i - window + 1)
-        window_values = values[start:i+1]
-        result.append(sum(window_values) / len(window_values))
-    
-    return result
+        return np.asarray(values, dtype=np.float64).tolist()
+    
+    # Window sums as differences of prefix sums: the first window - 1 points
+    # are plain prefix sums averaged over the values seen so far
+    sums = np.cumsum(np.asarray(values, dtype=np.float64))
+    sums[window:] -= sums[:-window].copy()
+    counts = np.minimum(np.arange(1, sums.size + 1), window)
+    return (sums / counts).tolist()
 
 
-def detect_trend_direction(values: List[float]) -> Dict[str, Any]:
+def detect_trend_direction(values: Series) -> Dict[str, Any]:
     """
     Detect overall trend direction using linear regression.
     """
@@ -40,18 +247,8 @@ def detect_trend_direction(values: List[float]) -> Dict[str, Any]:
             'confidence': 0.0
         }
     
-    x = np.arange(len(values))
-    y = np.array(values)
-    
-    # Linear regression
-    coefficients = np.polyfit(x, y, 1)
-    slope = coefficients[0]
-    
-    # Calculate R-squared for confidence
-    y_pred = np.polyval(coefficients, x)
-    ss_res = np.sum((y - y_pred) ** 2)
-    ss_tot = np.sum((y - np.mean(y)) ** 2)
-    r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
+    # Linear regression, with R-squared for confidence
+    slope, r_squared = _linear_fit_kernel(np.asarray(values, dtype=np.float64))
     
     # Determine direction
     if slope > 0.02:
@@ -68,7 +265,7 @@ def detect_trend_direction(values: List[float]) -> Dict[str, Any]:
     }
 
 
-def detect_change_points(values: List[float], threshold: float = 0.3) -> List[int]:
+def detect_change_points(values: Series, threshold: float = 0.3) -> List[int]:
     """
     Detect significant change points in the data.
     Returns indices where significant changes occur.
@@ -76,25 +273,20 @@ def detect_change_points(values: List[float], threshold: float = 0.3) -> List[in
     if len(values) < 3:
         return []
     
-    change_points = []
-    
-    for i in range(1, len(values) - 1):
-        # Calculate local change
-        before = values[i-1]
-        current = values[i]
-        after = values[i+1]
-        
-        # Check for significant change
-        change_before = abs(current - before)
-        change_after = abs(after - current)
-        
-        if change_before > threshold or change_after > threshold:
-            change_points.append(i)
-    
-    return change_points
+    # An interior point changes if the step into it or out of it is large
+    steps = np.diff(np.asarray(values, dtype=np.float64))
+    np.abs(steps, out=steps)
+    large = steps > threshold
+    return (np.flatnonzero(large[:-1] | large[1:]) + 1).tolist()
 
 
-def analyze_motivation_trend(responses: List[Dict[str, Any]], sentiment_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def analyze_motivation_trend(
+    responses: List[Dict[str, Any]],
+    sentiment_context: Optional[Dict[str, Any]] = None,
+    features: Optional[TrendFeatures] = None,
+    max_score: Optional[float] = None,
+    all_text: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Analyze motivation trend from responses.
     Uses sentiment and achievement-related keywords.
@@ -109,59 +301,43 @@ def analyze_motivation_trend(responses: List[Dict[str, Any]], sentiment_context:
             'data_points': []
         }
     
-    # Get sentiment context if not provided
-    if sentiment_context is None:
-        sentiment_context = analyze_sentiment_context(responses)
+    # Per-response inputs, unless precomputed by get_all_trends
+    if features is None:
+        features = _featurize(responses, all_text)
     
-    # Get score caps based on sentiment
-    score_caps = get_score_caps(sentiment_context)
-    max_score = score_caps.get('motivation', 1.0)
+    # Get score cap based on sentiment, unless provided by get_all_trends
+    if max_score is None:
+        if sentiment_context is None:
+            sentiment_context = analyze_sentiment_context(responses)
+        max_score = get_score_caps(sentiment_context).get('motivation', 1.0)
     
-    # Extract motivation indicators
-    motivation_keywords = {
-        'motivated', 'inspired', 'excited', 'passionate', 'driven',
-        'determined', 'goal', 'achieve', 'success', 'accomplished'
-    }
+    # Detect negative motivation indicators
+    stress_indicators = features.totals['stress']
+    low_motivation_indicators = features.totals['low_motivation']
     
-    # Combine all text for negative indicator detection
-    all_text = ' '.join(r.get('raw_response', '') for r in responses).lower()
+    # Base score from sentiment
+    score = (features.sentiment + 1) / 2  # Normalize to 0-1
     
-    # Detect negative motivation indicators
-    stress_indicators = sum(1 for kw in STRESS_KEYWORDS if kw in all_text)
-    low_motivation_indicators = sum(1 for kw in LOW_MOTIVATION_KEYWORDS if kw in all_text)
-    
-    scores = []
-    for resp in responses:
-        sentiment = resp.get('sentiment_score', 0)
-        keywords = set(resp.get('keywords', []))
-        input_quality = resp.get('input_quality', 1.0)
-        resp_text = resp.get('raw_response', '').lower()
-        
-        # Base score from sentiment
-        score = (sentiment + 1) / 2  # Normalize to 0-1
-        
-        # Boost for motivation keywords
-        motivation_match = len(keywords.intersection(motivation_keywords))
-        if motivation_match > 0:
-            score = min(1.0, score + 0.1 * motivation_match)
-        
-        # STRICT: Penalty for stress/pressure language in this response
-        if any(kw in resp_text for kw in STRESS_KEYWORDS):
-            score = score * 0.6
-        
-        # STRICT: Penalty for low motivation language
-        if any(kw in resp_text for kw in LOW_MOTIVATION_KEYWORDS):
-            score = score * 0.5
-        
-        # Apply quality penalty for low-quality inputs
-        if input_quality < 0.5:
-            # Reduce score significantly for poor responses
-            score = score * input_quality * 0.6
-        
-        scores.append(max(0, min(1, score)))
+    # Boost for motivation keywords
+    motivation_match = features.motivation_hits
+    score = np.where(motivation_match > 0, np.minimum(1.0, score + 0.1 * motivation_match), score)
+    
+    # STRICT: Penalty for stress/pressure language in each response
+    score = np.where(features.present['stress'], score * 0.6, score)
+    
+    # STRICT: Penalty for low motivation language
+    score = np.where(features.present['low_motivation'], score * 0.5, score)
+    
+    # Apply quality penalty for low-quality inputs
+    input_quality = features.input_quality
+    # Reduce score significantly for poor responses
+    score = np.where(features.low_quality, score * input_quality * 0.6, score)
+    
+    scores = np.clip(score, 0, 1, out=score)
     
     # Calculate overall metrics
-    avg_score = sum(scores) / len(scores)
+    raw_avg = float(scores.mean())
+    avg_score = raw_avg
     
     # STRICT: Apply score cap based on sentiment context
     avg_score = min(avg_score, max_score)
@@ -189,13 +365,21 @@ def analyze_motivation_trend(responses: List[Dict[str, Any]], sentiment_context:
         'score': round(avg_score, 2),
         'trend_direction': trend['direction'],
         'description': desc,
-        'data_points': [round(s, 2) for s in scores],
+        # Python round, not np.round: np.round scales by 100 first, so halfway
+        # scores such as 0.265 come out differently (0.26 instead of 0.27)
+        'data_points': [round(s, 2) for s in scores.tolist()],
         'confidence': trend['confidence'],
-        'score_capped': avg_score < (sum(scores) / len(scores)) if scores else False
+        'score_capped': avg_score < raw_avg
     }
 
 
-def analyze_consistency(responses: List[Dict[str, Any]], sentiment_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def analyze_consistency(
+    responses: List[Dict[str, Any]],
+    sentiment_context: Optional[Dict[str, Any]] = None,
+    features: Optional[TrendFeatures] = None,
+    max_score: Optional[float] = None,
+    all_text: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Analyze behavioral consistency from responses.
     Applies score caps when negative sentiment dominates.
@@ -209,72 +393,48 @@ def analyze_consistency(responses: List[Dict[str, Any]], sentiment_context: Opti
             'data_points': []
         }
     
-    # Get sentiment context if not provided
-    if sentiment_context is None:
-        sentiment_context = analyze_sentiment_context(responses)
+    # Per-response inputs, unless precomputed by get_all_trends
+    if features is None:
+        features = _featurize(responses, all_text)
     
-    # Get score caps based on sentiment
-    score_caps = get_score_caps(sentiment_context)
-    max_score = score_caps.get('consistency', 1.0)
-    
-    # Combine all text for negative indicator detection
-    all_text = ' '.join(r.get('raw_response', '') for r in responses).lower()
+    # Get score cap based on sentiment, unless provided by get_all_trends
+    if max_score is None:
+        if sentiment_context is None:
+            sentiment_context = analyze_sentiment_context(responses)
+        max_score = get_score_caps(sentiment_context).get('consistency', 1.0)
     
     # Detect overwhelming/exhausting routine descriptions
-    exhaustion_keywords = {'tiring', 'exhausting', 'overwhelming', 'draining', 'too much', 'burnt out'}
-    exhaustion_count = sum(1 for kw in exhaustion_keywords if kw in all_text)
+    exhaustion_count = features.totals['exhaustion']
     
-    # Look for consistency indicators
-    consistency_keywords = {
-        'routine', 'habit', 'regular', 'daily', 'always', 'consistent',
-        'discipline', 'practice', 'maintain', 'steady'
-    }
+    input_quality = features.input_quality
     
-    volatility_keywords = {
-        'change', 'different', 'varies', 'sometimes', 'unpredictable',
-        'spontaneous', 'flexible'
-    }
+    # STRICT: Start with lower base for low-quality inputs
+    score = np.where(features.low_quality, 0.15, 0.5)
     
-    scores = []
-    for resp in responses:
-        keywords = set(k.lower() for k in resp.get('keywords', []))
-        text = resp.get('raw_response', '').lower()
-        input_quality = resp.get('input_quality', 1.0)
-        
-        # STRICT: Start with lower base for low-quality inputs
-        base_score = 0.5 if input_quality >= 0.5 else 0.15
-        score = base_score
-        
-        # Check for consistency indicators
-        for kw in consistency_keywords:
-            if kw in text:
-                score += 0.08
-        
-        # Check for volatility indicators
-        for kw in volatility_keywords:
-            if kw in text:
-                score -= 0.05
-        
-        # STRICT: Penalty for exhaustion/overwhelming language
-        if any(kw in text for kw in exhaustion_keywords):
-            score = score * 0.4
-        
-        # Apply quality penalty
-        if input_quality < 0.5:
-            score = score * input_quality * 0.5
-        
-        scores.append(max(0, min(1, score)))
+    # Check for consistency indicators
+    score = _add_per_hit(score, features.hits['consistency'], 0.08)
+    
+    # Check for volatility indicators
+    score = _add_per_hit(score, features.hits['volatility'], -0.05)
+    
+    # STRICT: Penalty for exhaustion/overwhelming language
+    score = np.where(features.present['exhaustion'], score * 0.4, score)
+    
+    # Apply quality penalty
+    score = np.where(features.low_quality, score * input_quality * 0.5, score)
+    
+    scores = np.clip(score, 0, 1, out=score)
     
     # Calculate volatility from sentiment changes
-    sentiments = [r.get('sentiment_score', 0) for r in responses]
+    sentiments = features.sentiment
     if len(sentiments) > 1:
-        changes = [abs(sentiments[i] - sentiments[i-1]) for i in range(1, len(sentiments))]
-        avg_change = sum(changes) / len(changes)
+        avg_change = float(np.abs(np.diff(sentiments)).mean())
         volatility_penalty = min(0.3, avg_change)
     else:
         volatility_penalty = 0
     
-    avg_score = max(0, sum(scores) / len(scores) - volatility_penalty)
+    raw_avg = float(scores.mean()) - volatility_penalty
+    avg_score = max(0, raw_avg)
     
     # STRICT: Apply score cap based on sentiment context
     avg_score = min(avg_score, max_score)
@@ -300,13 +460,19 @@ def analyze_consistency(responses: List[Dict[str, Any]], sentiment_context: Opti
         'score': round(avg_score, 2),
         'trend_direction': 'stable',
         'description': desc,
-        'data_points': [round(s, 2) for s in scores],
+        'data_points': [round(s, 2) for s in scores.tolist()],
         'volatility': round(volatility_penalty, 2) if len(sentiments) > 1 else 0,
-        'score_capped': avg_score < (sum(scores) / len(scores) - volatility_penalty) if scores else False
+        'score_capped': avg_score < raw_avg
     }
 
 
-def analyze_growth_orientation(responses: List[Dict[str, Any]], sentiment_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def analyze_growth_orientation(
+    responses: List[Dict[str, Any]],
+    sentiment_context: Optional[Dict[str, Any]] = None,
+    features: Optional[TrendFeatures] = None,
+    max_score: Optional[float] = None,
+    all_text: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Analyze growth mindset and orientation.
     Applies score caps when negative sentiment dominates.
@@ -320,74 +486,50 @@ def analyze_growth_orientation(responses: List[Dict[str, Any]], sentiment_contex
             'data_points': []
         }
     
-    # Get sentiment context if not provided
-    if sentiment_context is None:
-        sentiment_context = analyze_sentiment_context(responses)
-    
-    # Get score caps based on sentiment
-    score_caps = get_score_caps(sentiment_context)
-    max_score = score_caps.get('growth', 1.0)
+    # Per-response inputs, unless precomputed by get_all_trends
+    if features is None:
+        features = _featurize(responses, all_text)
     
-    # Combine all text for negative indicator detection
-    all_text = ' '.join(r.get('raw_response', '') for r in responses).lower()
+    # Get score cap based on sentiment, unless provided by get_all_trends
+    if max_score is None:
+        if sentiment_context is None:
+            sentiment_context = analyze_sentiment_context(responses)
+        max_score = get_score_caps(sentiment_context).get('growth', 1.0)
     
     # Detect uncertainty about growth indicators
-    uncertainty_indicators = sum(1 for kw in UNCERTAINTY_KEYWORDS if kw in all_text)
-    fear_indicators = sum(1 for kw in FEAR_DISCOURAGEMENT_KEYWORDS if kw in all_text)
+    uncertainty_indicators = features.totals['uncertainty']
+    fear_indicators = features.totals['fear']
     
-    # Keywords suggesting growth feels forced or unclear
-    forced_growth_keywords = {'forced', 'have to', 'must', 'pressure', 'expected', 'should'}
-    forced_count = sum(1 for kw in forced_growth_keywords if kw in all_text)
+    # Growth that feels forced or unclear
+    forced_count = features.totals['forced_growth']
     
-    growth_keywords = {
-        'learned', 'growth', 'improved', 'developed', 'grew', 'progress',
-        'challenge', 'opportunity', 'new', 'skill', 'knowledge', 'better',
-        'evolved', 'adapted', 'overcame', 'self-improvement'
-    }
+    # Distinct growth keywords in order of first appearance
+    indicators = list(dict.fromkeys(chain.from_iterable(features.growth_found)))
     
-    fixed_keywords = {
-        'stuck', "can't", 'impossible', 'always been', 'never could',
-        'born', 'natural', 'talent', 'gifted', 'hopeless', 'pointless'
-    }
+    input_quality = features.input_quality
     
-    scores = []
-    indicators = []
+    # STRICT: Start with lower base score for low-quality inputs
+    score = np.where(features.low_quality, 0.10, 0.5)
     
-    for resp in responses:
-        text = resp.get('raw_response', '').lower()
-        keywords = resp.get('keywords', [])
-        input_quality = resp.get('input_quality', 1.0)
-        
-        # STRICT: Start with lower base score for low-quality inputs
-        score = 0.5 if input_quality >= 0.5 else 0.10
-        
-        # Check for growth indicators
-        for kw in growth_keywords:
-            if kw in text:
-                score += 0.07
-                if kw not in indicators:
-                    indicators.append(kw)
-        
-        # Check for fixed mindset indicators
-        for kw in fixed_keywords:
-            if kw in text:
-                score -= 0.12  # STRICT: Increased penalty
-        
-        # STRICT: Penalty for uncertainty language
-        if any(kw in text for kw in UNCERTAINTY_KEYWORDS):
-            score = score * 0.7
-        
-        # STRICT: Penalty for fear/discouragement language
-        if any(kw in text for kw in FEAR_DISCOURAGEMENT_KEYWORDS):
-            score = score * 0.5
-        
-        # Apply quality penalty
-        if input_quality < 0.5:
-            score = score * input_quality * 0.5
-        
-        scores.append(max(0, min(1, score)))
+    # Check for growth indicators
+    score = _add_per_hit(score, features.hits['growth'], 0.07)
+    
+    # Check for fixed mindset indicators
+    score = _add_per_hit(score, features.hits['fixed_mindset'], -0.12)  # STRICT: Increased penalty
+    
+    # STRICT: Penalty for uncertainty language
+    score = np.where(features.present['uncertainty'], score * 0.7, score)
+    
+    # STRICT: Penalty for fear/discouragement language
+    score = np.where(features.present['fear'], score * 0.5, score)
+    
+    # Apply quality penalty
+    score = np.where(features.low_quality, score * input_quality * 0.5, score)
+    
+    scores = np.clip(score, 0, 1, out=score)
     
-    avg_score = sum(scores) / len(scores)
+    raw_avg = float(scores.mean())
+    avg_score = raw_avg
     
     # STRICT: Apply score cap based on sentiment context
     avg_score = min(avg_score, max_score)
@@ -417,13 +559,19 @@ def analyze_growth_orientation(responses: List[Dict[str, Any]], sentiment_contex
         'score': round(avg_score, 2),
         'trend_direction': trend['direction'],
         'description': desc,
-        'data_points': [round(s, 2) for s in scores],
+        'data_points': [round(s, 2) for s in scores.tolist()],
         'indicators': indicators[:5],  # Top 5 indicators
-        'score_capped': avg_score < (sum(scores) / len(scores)) if scores else False
+        'score_capped': avg_score < raw_avg
     }
 
 
-def analyze_stress_response(responses: List[Dict[str, Any]], sentiment_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def analyze_stress_response(
+    responses: List[Dict[str, Any]],
+    sentiment_context: Optional[Dict[str, Any]] = None,
+    features: Optional[TrendFeatures] = None,
+    max_score: Optional[float] = None,
+    all_text: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Analyze stress response patterns.
     Applies score caps when negative sentiment dominates.
@@ -437,88 +585,48 @@ def analyze_stress_response(responses: List[Dict[str, Any]], sentiment_context:
             'data_points': []
         }
     
-    # Get sentiment context if not provided
-    if sentiment_context is None:
-        sentiment_context = analyze_sentiment_context(responses)
-    
-    # Get score caps based on sentiment
-    score_caps = get_score_caps(sentiment_context)
-    max_score = score_caps.get('stress_response', 1.0)
+    # Per-response inputs, unless precomputed by get_all_trends
+    if features is None:
+        features = _featurize(responses, all_text)
     
-    # Combine all text for negative indicator detection
-    all_text = ' '.join(r.get('raw_response', '') for r in responses).lower()
+    # Get score cap based on sentiment, unless provided by get_all_trends
+    if max_score is None:
+        if sentiment_context is None:
+            sentiment_context = analyze_sentiment_context(responses)
+        max_score = get_score_caps(sentiment_context).get('stress_response', 1.0)
     
     # Detect fear/discouragement indicators
-    fear_indicators = sum(1 for kw in FEAR_DISCOURAGEMENT_KEYWORDS if kw in all_text)
-    stress_indicators = sum(1 for kw in STRESS_KEYWORDS if kw in all_text)
+    fear_indicators = features.totals['fear']
+    stress_indicators = features.totals['stress']
     
-    # Active coping indicators
-    active_coping = {
-        'handled', 'managed', 'solved', 'addressed', 'faced', 'overcame',
-        'dealt', 'took action', 'worked through', 'found solution'
-    }
+    pattern = 'balanced'
     
-    # Avoidance indicators - expanded
-    avoidance = {
-        'avoided', 'ignored', 'gave up', 'quit', 'walked away',
-        "couldn't handle", 'too much', 'ran away', 'escaped',
-        'shut down', 'frozen', 'paralyzed', 'overwhelmed'
-    }
+    # Analyze coping style
+    active_count = int(features.hits['active_coping'].sum())
+    support_count = int(features.hits['support_seeking'].sum())
+    avoidance_count = int(features.hits['avoidance'].sum())
     
-    # Support-seeking indicators
-    support_seeking = {
-        'help', 'support', 'talked', 'asked', 'reached out', 'team',
-        'family', 'friends', 'mentor'
-    }
+    # Calculate resilience score
+    sentiment_part = (features.sentiment + 1) / 10
+    score = np.where(
+        features.present['active_coping'], 0.7 + sentiment_part,
+        np.where(features.present['support_seeking'], 0.6 + sentiment_part, 0.5 + sentiment_part)
+    )
     
-    coping_scores = []
-    pattern = 'balanced'
+    # STRICT: Penalty for avoidance indicators
+    score = np.where(features.present['avoidance'], score * 0.5, score)
     
-    active_count = 0
-    support_count = 0
-    avoidance_count = 0
+    # STRICT: Penalty for fear/discouragement in each response
+    score = np.where(features.present['fear'], score * 0.6, score)
     
-    for resp in responses:
-        text = resp.get('raw_response', '').lower()
-        sentiment = resp.get('sentiment_score', 0)
-        input_quality = resp.get('input_quality', 1.0)
-        
-        # Analyze coping style
-        for kw in active_coping:
-            if kw in text:
-                active_count += 1
-        
-        for kw in support_seeking:
-            if kw in text:
-                support_count += 1
-        
-        for kw in avoidance:
-            if kw in text:
-                avoidance_count += 1
-        
-        # Calculate resilience score
-        if any(kw in text for kw in active_coping):
-            score = 0.7 + (sentiment + 1) / 10
-        elif any(kw in text for kw in support_seeking):
-            score = 0.6 + (sentiment + 1) / 10
-        else:
-            score = 0.5 + (sentiment + 1) / 10
-        
-        # STRICT: Penalty for avoidance indicators
-        if any(kw in text for kw in avoidance):
-            score = score * 0.5
-        
-        # STRICT: Penalty for fear/discouragement in this response
-        if any(kw in text for kw in FEAR_DISCOURAGEMENT_KEYWORDS):
-            score = score * 0.6
-        
-        # STRICT: Quality penalty
-        if input_quality < 0.5:
-            score = score * input_quality * 0.6
-        
-        coping_scores.append(max(0, min(1, score)))
+    # STRICT: Quality penalty
+    input_quality = features.input_quality
+    score = np.where(features.low_quality, score * input_quality * 0.6, score)
+    
+    coping_scores = np.clip(score, 0, 1, out=score)
     
-    avg_score = sum(coping_scores) / len(coping_scores) if coping_scores else 0.5
+    raw_avg = float(coping_scores.mean()) if coping_scores.size else 0.5
+    avg_score = raw_avg
     
     # STRICT: Apply score cap based on sentiment context
     avg_score = min(avg_score, max_score)
@@ -554,30 +662,49 @@ def analyze_stress_response(responses: List[Dict[str, Any]], sentiment_context:
         'pattern': pattern,
         'trend_direction': 'stable',
         'description': desc,
-        'data_points': [round(s, 2) for s in coping_scores],
-        'score_capped': avg_score < (sum(coping_scores) / len(coping_scores)) if coping_scores else False
+        'data_points': [round(s, 2) for s in coping_scores.tolist()],
+        'score_capped': avg_score < raw_avg if coping_scores.size else False
     }
 
 
-def get_all_trends(responses: List[Dict[str, Any]], sentiment_context: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+def get_all_trends(
+    responses: List[Dict[str, Any]],
+    sentiment_context: Optional[Dict[str, Any]] = None,
+    all_text: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
     """
     Get all trend analyses with sentiment context for stricter scoring.
     
     Args:
         responses: List of structured response dicts
         sentiment_context: Optional pre-computed sentiment context
+        all_text: Optional pre-joined lowercased response text
+        
+    Each response is lowercased and keyword-scanned once, and the resulting
+    TrendFeatures arrays and the score caps are shared by all four analyzers.
         
     Returns:
         Dict with all trend analyses including sentiment_context
     """
     # Compute sentiment context once and pass to all functions
     if sentiment_context is None:
-        sentiment_context = analyze_sentiment_context(responses)
+        sentiment_context = analyze_sentiment_context(responses, all_text)
+    
+    features = _featurize(responses, all_text)
+    score_caps = get_score_caps(sentiment_context)
     
     return {
-        'motivation': analyze_motivation_trend(responses, sentiment_context),
-        'consistency': analyze_consistency(responses, sentiment_context),
-        'growth': analyze_growth_orientation(responses, sentiment_context),
-        'stress_response': analyze_stress_response(responses, sentiment_context),
+        'motivation': analyze_motivation_trend(
+            responses, sentiment_context, features, max_score=score_caps.get('motivation', 1.0)
+        ),
+        'consistency': analyze_consistency(
+            responses, sentiment_context, features, max_score=score_caps.get('consistency', 1.0)
+        ),
+        'growth': analyze_growth_orientation(
+            responses, sentiment_context, features, max_score=score_caps.get('growth', 1.0)
+        ),
+        'stress_response': analyze_stress_response(
+            responses, sentiment_context, features, max_score=score_caps.get('stress_response', 1.0)
+        ),
         'sentiment_context': sentiment_context  # Include for report generation
     }
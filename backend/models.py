@@ -2,20 +2,14 @@
 Pydantic models for the Psychological Trend Analysis System
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
-from enum import Enum
 
 
-class MessageRole(str, Enum):
-    USER = "user"
-    BOT = "bot"
+# Literal types validate as a plain string-set check, cheaper than enum coercion
+MessageRole = Literal["user", "bot"]
 
-
-class SentimentCategory(str, Enum):
-    POSITIVE = "positive"
-    NEGATIVE = "negative"
-    NEUTRAL = "neutral"
+SentimentCategory = Literal["positive", "negative", "neutral"]
 
 
 class Message(BaseModel):
@@ -5,16 +5,90 @@ Uses qwen2.5:7b model for text generation
 import httpx
 import json
 import asyncio
-from typing import Optional, Dict, Any
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, AsyncIterator, Awaitable, Callable, Tuple, Union
+from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception_type
+
+import database as db
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - request and response bodies then use the json module
+    orjson = None
 
 
 # Configuration
 OLLAMA_BASE_URL = "http://localhost:11434"
+# Unix socket path to reach a same-host Ollama without the TCP loopback stack
+# (e.g. a socket proxied to its port); None connects to OLLAMA_BASE_URL over TCP
+OLLAMA_UDS: Optional[str] = None
 DEFAULT_MODEL = "qwen2.5:7b"
 DEFAULT_TEMPERATURE = 0.2
 DEFAULT_TIMEOUT = 60.0
 MAX_TOKENS = 1024
+# How long Ollama keeps the model, and the KV cache of the last prompt prefix,
+# loaded after a request. Ollama's own default is 5 minutes.
+KEEP_ALIVE = "1h"
+# Context window; the full report prompt plus its 1800-token answer needs more
+# than 2048. Kept the same for every request, as a change reloads the model.
+NUM_CTX = 4096
+
+# Requests sent to Ollama at once; more would only queue inside Ollama, where
+# their read timeout already runs. Match the server's OLLAMA_NUM_PARALLEL.
+MAX_INFLIGHT = 4
+
+# Keep idle connections open well past httpx's 5s default, since LLM calls
+# within one report arrive seconds apart
+CONNECTION_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0
+)
+
+# Response cache: identical low-temperature requests reuse the earlier output
+CACHE_MAX_ENTRIES = 1000
+CACHE_TTL_SECONDS = 24 * 60 * 60
+CACHE_MAX_TEMPERATURE = 0.3
+# Rows kept in the database cache, which only holds requests made with persist=True
+CACHE_MAX_PERSISTED = 5000
+
+# Healthy /api/tags results are reused for this long
+HEALTH_CACHE_SECONDS = 5.0
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class TransientHTTPError(Exception):
+    """Ollama answered with a 5xx status, which is worth retrying"""
+    
+    def __init__(self, status_code: int):
+        super().__init__(f"API error: {status_code}")
+        self.status_code = status_code
+
+
+# Failures that may succeed on another attempt
+RETRYABLE_ERRORS = (
+    httpx.TimeoutException,
+    httpx.ConnectError,
+    httpx.ReadError,
+    httpx.RemoteProtocolError,
+    TransientHTTPError
+)
+
+
+def _dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """Compact UTF-8 JSON, the same encoding httpx produces for json= bodies"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else None)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys).encode()
+
+
+def _loads(content: Union[bytes, str]) -> Any:
+    """Parse a JSON response body"""
+    return orjson.loads(content) if orjson is not None else json.loads(content)
 
 
 class OllamaClient:
@@ -25,20 +99,35 @@ class OllamaClient:
         base_url: str = OLLAMA_BASE_URL,
         model: str = DEFAULT_MODEL,
         temperature: float = DEFAULT_TEMPERATURE,
-        timeout: float = DEFAULT_TIMEOUT
+        timeout: float = DEFAULT_TIMEOUT,
+        uds: Optional[str] = OLLAMA_UDS,
+        keep_alive: str = KEEP_ALIVE,
+        num_ctx: int = NUM_CTX,
+        max_inflight: int = MAX_INFLIGHT
     ):
         self.base_url = base_url
         self.model = model
         self.temperature = temperature
         self.timeout = timeout
+        self.uds = uds
+        self.keep_alive = keep_alive
+        self.num_ctx = num_ctx
         self._client: Optional[httpx.AsyncClient] = None
+        self._slots = asyncio.Semaphore(max_inflight)
+        self._default_options = {"temperature": temperature, "num_predict": MAX_TOKENS, "num_ctx": num_ctx}
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+        self._health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
     
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client"""
         if self._client is None or self._client.is_closed:
+            # Connection failures are retried by _send, so the transport itself never retries
+            transport = httpx.AsyncHTTPTransport(uds=self.uds, limits=CONNECTION_LIMITS, retries=0)
             self._client = httpx.AsyncClient(
                 base_url=self.base_url,
-                timeout=httpx.Timeout(self.timeout)
+                timeout=httpx.Timeout(self.timeout),
+                transport=transport
             )
         return self._client
     
@@ -48,24 +137,228 @@ class OllamaClient:
             await self._client.aclose()
             self._client = None
     
+    def clear_cache(self):
+        """Forget cached responses and health, e.g. once user data is deleted"""
+        self._cache.clear()
+        self._health_cache = None
+    
+    async def __aenter__(self) -> "OllamaClient":
+        await self._get_client()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    def _payload(
+        self,
+        stream: bool,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        **fields: Any
+    ) -> Dict[str, Any]:
+        """Request payload; the default options dict is shared when nothing is overridden"""
+        if temperature is None and max_tokens is None:
+            options = self._default_options
+        else:
+            options = {
+                "temperature": temperature or self.temperature,
+                "num_predict": max_tokens or MAX_TOKENS,
+                "num_ctx": self.num_ctx
+            }
+        return {
+            "model": self.model,
+            **fields,
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            "options": options
+        }
+    
+    @staticmethod
+    def _cache_key(endpoint: str, payload: Dict[str, Any]) -> Optional[str]:
+        """Cache key for a request, or None if its temperature is too high to cache"""
+        if payload["options"]["temperature"] > CACHE_MAX_TEMPERATURE:
+            return None
+        return hashlib.sha256(endpoint.encode() + _dumps(payload, sort_keys=True)).hexdigest()
+    
+    def _cache_get(self, key: Optional[str], persist: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Cached result for key, if present and not expired.
+        Memory is checked first, then (with persist) the database cache shared
+        across restarts.
+        """
+        if key is None:
+            return None
+        if key in self._cache:
+            stored_at, result = self._cache[key]
+            if time.monotonic() - stored_at <= CACHE_TTL_SECONDS:
+                self._cache.move_to_end(key)
+                return dict(result)
+            del self._cache[key]
+        if persist:
+            result = db.get_cached_llm_result(key, CACHE_TTL_SECONDS)
+            if result is not None:
+                self._cache_put(key, result, persist=False)
+                return result
+        return None
+    
+    def _cache_put(self, key: Optional[str], result: Dict[str, Any], persist: bool = False):
+        """
+        Store a successful result, evicting the least recently used entries.
+        With persist, it is also written to the database cache.
+        """
+        if key is None:
+            return
+        self._cache[key] = (time.monotonic(), dict(result))
+        self._cache.move_to_end(key)
+        while len(self._cache) > CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+        if persist:
+            db.save_cached_llm_result(key, result, CACHE_TTL_SECONDS, CACHE_MAX_PERSISTED)
+    
+    async def _single_flight(
+        self,
+        key: Optional[str],
+        request: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Run request, or join an identical request that is already in flight.
+        
+        The request runs as its own task, so a caller being cancelled doesn't
+        abort it for the others waiting on the same result.
+        """
+        if key is None:
+            return await request()
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(request())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return dict(await asyncio.shield(task))
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_random_exponential(multiplier=1, max=30),
+        retry=retry_if_exception_type(RETRYABLE_ERRORS),
+        reraise=True
+    )
+    async def _send(self, client: httpx.AsyncClient, path: str, payload: Dict[str, Any]) -> httpx.Response:
+        """
+        POST a payload, retrying connection failures and 5xx responses with jittered backoff.
+        Each attempt holds one of the max_inflight slots; the backoff waits don't.
+        """
+        async with self._slots:
+            response = await client.post(path, content=_dumps(payload), headers=JSON_HEADERS)
+        if 500 <= response.status_code < 600:
+            raise TransientHTTPError(response.status_code)
+        return response
+    
+    async def _post(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        extract: Callable[[Dict[str, Any]], str],
+        persist: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Send a non-streaming generation request through the response cache.
+        
+        Args:
+            path: API endpoint, e.g. "/api/generate"
+            payload: Request payload from _payload
+            extract: Pulls the generated text out of the response JSON
+            persist: Also cache the result in the database (see generate)
+            
+        Returns:
+            Dict with 'success', 'response', and optionally 'error'
+        """
+        cache_key = self._cache_key(path, payload)
+        cached = self._cache_get(cache_key, persist)
+        if cached is not None:
+            return cached
+        
+        async def request() -> Dict[str, Any]:
+            client = await self._get_client()
+            try:
+                response = await self._send(client, path, payload)
+                
+                if response.status_code == 200:
+                    data = _loads(response.content)
+                    result = {
+                        "success": True,
+                        "response": extract(data),
+                        "model": data.get("model", self.model),
+                        "done": data.get("done", True)
+                    }
+                    self._cache_put(cache_key, result, persist)
+                    return result
+                else:
+                    return {
+                        "success": False,
+                        "error": f"API error: {response.status_code}",
+                        "response": None
+                    }
+            except httpx.TimeoutException:
+                return {
+                    "success": False,
+                    "error": "Request timed out",
+                    "response": None
+                }
+            except Exception as e:
+                return {
+                    "success": False,
+                    "error": str(e),
+                    "response": None
+                }
+        
+        return await self._single_flight(cache_key, request)
+    
+    async def preload(self) -> bool:
+        """
+        Load the model into Ollama without generating anything, so the first
+        real request doesn't wait for it. Returns whether the load succeeded.
+        """
+        # A request without a prompt only loads the model; num_ctx must match
+        # later requests, or Ollama reloads the model for them
+        payload = {
+            "model": self.model,
+            "keep_alive": self.keep_alive,
+            "options": {"num_ctx": self.num_ctx}
+        }
+        try:
+            client = await self._get_client()
+            response = await client.post("/api/generate", content=_dumps(payload), headers=JSON_HEADERS)
+            return response.status_code == 200
+        except Exception:
+            return False
+    
     async def health_check(self) -> Dict[str, Any]:
-        """Check if Ollama server is running and model is available"""
+        """
+        Check if Ollama server is running and model is available.
+        A healthy result is reused for HEALTH_CACHE_SECONDS; errors are always rechecked.
+        """
+        if self._health_cache is not None:
+            checked_at, health = self._health_cache
+            if time.monotonic() - checked_at < HEALTH_CACHE_SECONDS:
+                return dict(health)
+        
         try:
             client = await self._get_client()
             response = await client.get("/api/tags")
             
             if response.status_code == 200:
-                data = response.json()
+                data = _loads(response.content)
                 models = [m.get("name", "") for m in data.get("models", [])]
                 model_available = any(self.model in m for m in models)
                 
-                return {
+                health = {
                     "status": "healthy",
                     "ollama_running": True,
                     "model_available": model_available,
                     "configured_model": self.model,
                     "available_models": models
                 }
+                self._health_cache = (time.monotonic(), health)
+                return dict(health)
             else:
                 return {
                     "status": "error",
@@ -85,43 +378,35 @@ class OllamaClient:
                 "error": str(e)
             }
     
-    @retry(
-        stop=stop_after_attempt(2),
-        wait=wait_exponential(multiplier=1, min=1, max=5),
-        retry=retry_if_exception_type((httpx.TimeoutException, httpx.ConnectError))
-    )
     async def generate(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
-        json_mode: bool = False
+        json_mode: bool = False,
+        persist: bool = False
     ) -> Dict[str, Any]:
         """
         Generate text using Ollama API
         
         Args:
             prompt: The user prompt
-            system_prompt: Optional system prompt for context
+            system_prompt: Optional system prompt for context. Ollama places it
+                before the prompt and can reuse its KV cache only while it stays
+                byte-identical, so pass a fixed constant and put per-request
+                values (names, scores) in prompt
             temperature: Override default temperature
             max_tokens: Maximum tokens to generate
             json_mode: If True, request JSON formatted response
+            persist: If True, also cache the result in the database, where it
+                outlives restarts and session deletion. Only for prompts that
+                contain no user input
             
         Returns:
             Dict with 'success', 'response', and optionally 'error'
         """
-        client = await self._get_client()
-        
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": temperature or self.temperature,
-                "num_predict": max_tokens or MAX_TOKENS
-            }
-        }
+        payload = self._payload(False, temperature, max_tokens, prompt=prompt)
         
         if system_prompt:
             payload["system"] = system_prompt
@@ -129,35 +414,53 @@ class OllamaClient:
         if json_mode:
             payload["format"] = "json"
         
-        try:
-            response = await client.post("/api/generate", json=payload)
+        return await self._post("/api/generate", payload, lambda data: data.get("response", ""), persist)
+    
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate text using Ollama API, yielding chunks as they are decoded
+        
+        Unlike generate, the first text arrives after prompt processing rather
+        than after the full completion, for callers that relay it as it comes.
+        Responses are not cached.
+        
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional system prompt for context (a fixed constant,
+                as for generate)
+            temperature: Override default temperature
+            max_tokens: Maximum tokens to generate
             
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "success": True,
-                    "response": data.get("response", ""),
-                    "model": data.get("model", self.model),
-                    "done": data.get("done", True)
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"API error: {response.status_code}",
-                    "response": None
-                }
-        except httpx.TimeoutException:
-            return {
-                "success": False,
-                "error": "Request timed out",
-                "response": None
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "response": None
-            }
+        Yields:
+            Response text chunks
+            
+        Raises:
+            httpx.HTTPError: On connection failures, timeouts or API errors
+        """
+        client = await self._get_client()
+        
+        payload = self._payload(True, temperature, max_tokens, prompt=prompt)
+        
+        if system_prompt:
+            payload["system"] = system_prompt
+        
+        async with self._slots:
+            async with client.stream("POST", "/api/generate", content=_dumps(payload), headers=JSON_HEADERS) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = _loads(line)
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        break
     
     async def generate_with_messages(
         self,
@@ -176,48 +479,11 @@ class OllamaClient:
         Returns:
             Dict with 'success', 'response', and optionally 'error'
         """
-        client = await self._get_client()
-        
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "stream": False,
-            "options": {
-                "temperature": temperature or self.temperature,
-                "num_predict": max_tokens or MAX_TOKENS
-            }
-        }
+        payload = self._payload(False, temperature, max_tokens, messages=messages)
         
-        try:
-            response = await client.post("/api/chat", json=payload)
-            
-            if response.status_code == 200:
-                data = response.json()
-                message = data.get("message", {})
-                return {
-                    "success": True,
-                    "response": message.get("content", ""),
-                    "model": data.get("model", self.model),
-                    "done": data.get("done", True)
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"API error: {response.status_code}",
-                    "response": None
-                }
-        except httpx.TimeoutException:
-            return {
-                "success": False,
-                "error": "Request timed out",
-                "response": None
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "response": None
-            }
+        return await self._post(
+            "/api/chat", payload, lambda data: data.get("message", {}).get("content", "")
+        )
 
 
 # Global client instance
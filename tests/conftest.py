@@ -0,0 +1,8 @@
+"""
+Backend modules import each other by top-level name (e.g. `from ml_engine...`),
+so tests run with backend/ on the import path, as the app does.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
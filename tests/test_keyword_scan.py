@@ -0,0 +1,54 @@
+"""
+Tests for whole-word keyword matching
+"""
+from ml_engine.keyword_scan import KeywordScanner, tokenize_words
+from ml_engine.sentiment_context import CONTEXT_SCANNER
+from ml_engine.trends import TREND_SCANNER, _featurize
+
+
+def test_tokens_drop_quotes_and_possessives():
+    tokens = tokenize_words("my family's support, friends' advice and 'tired'")
+    assert {"family", "friends", "tired", "support", "advice"} <= tokens
+    assert not any("'" in token for token in tokens)
+
+
+def test_tokens_keep_inner_apostrophes():
+    assert {"can't", "won't"} <= tokenize_words("i can't, it won't")
+
+
+def test_possessive_keywords_match():
+    found = TREND_SCANNER.scan("my family's support and my friends' advice")
+    assert found["support_seeking"] == {"family", "friends", "support"}
+
+
+def test_quoted_keywords_match():
+    counts = CONTEXT_SCANNER.counts("i felt 'stressed' and 'tired'")
+    assert counts["stress"] == 2
+
+
+def test_whole_words_only():
+    scanner = KeywordScanner({"help": ["help"]}, whole_words=True)
+    assert scanner.counts("that was helpful")["help"] == 0
+    assert scanner.counts("it would help")["help"] == 1
+
+
+def test_quoted_phrases_match():
+    counts = CONTEXT_SCANNER.counts("honestly i'm 'burnt out' and i 'don't know'")
+    assert counts["stress"] == 1
+    assert counts["uncertainty"] == 1
+
+
+def test_phrases_match_on_word_boundaries_only():
+    found = TREND_SCANNER.scan("we took actions, then reached out's")
+    assert "took action" not in found["active_coping"]
+    assert "reached out" in found["support_seeking"]
+
+
+def test_positions_skip_matches_inside_longer_words():
+    positions = TREND_SCANNER.positions("renewable energy is better and new")
+    assert positions["growth"] == {"better": 20, "new": 31}
+
+
+def test_growth_keywords_in_order_of_appearance():
+    features = _featurize([{"raw_response": "Renewable energy is better and new", "sentiment_score": 0.5}])
+    assert features.growth_found == [["better", "new"]]